@@ -16,7 +16,8 @@ class VaultConfig:
 	encrypted: bool = False
 	salt: Optional[str] = None  # Base64 encoded encryption salt
 	check_value: Optional[str] = None  # Encrypted verification string
-	partition_size: int = 50 * 1024 * 1024  # 50MB default, 0 = disabled
+	partition_size: int = FilePartitioner.DEFAULT_CHUNK_SIZE  # 64MB default, 0 = disabled
+	hash_algo: str = "sha256"  # Content hash for new blobs: "sha256" or "blake3"
 	version: int = 2  # Schema version for future migrations
 	
 	def to_dict(self) -> dict:
@@ -58,6 +59,9 @@ class VaultConfig:
 		if self.partition_size < 0:
 			logger.error("Partition size cannot be negative")
 			return False
+		if self.hash_algo not in ("sha256", "blake3"):
+			logger.error(f"Unknown hash algorithm: {self.hash_algo}")
+			return False
 		return True
 
 
@@ -150,7 +154,7 @@ class VaultConfigManager:
 		
 		logger.info(f"Encrypting {total} blobs...")
 		
-		with self.dlfi.conn:
+		with self.dlfi.transaction():
 			for i, file_hash in enumerate(blob_hashes, 1):
 				try:
 					# Read plaintext data
@@ -223,7 +227,7 @@ class VaultConfigManager:
 		
 		logger.info(f"Decrypting {total} blobs...")
 		
-		with self.dlfi.conn:
+		with self.dlfi.transaction():
 			for i, file_hash in enumerate(blob_hashes, 1):
 				try:
 					# Read encrypted data
@@ -303,7 +307,7 @@ class VaultConfigManager:
 		
 		logger.info(f"Re-encrypting {total} blobs with new password...")
 		
-		with self.dlfi.conn:
+		with self.dlfi.transaction():
 			for i, file_hash in enumerate(blob_hashes, 1):
 				try:
 					# Read encrypted data
@@ -376,7 +380,7 @@ class VaultConfigManager:
 		
 		logger.info(f"Re-partitioning {total} blobs...")
 		
-		with self.dlfi.conn:
+		with self.dlfi.transaction():
 			for i, file_hash in enumerate(blob_hashes, 1):
 				try:
 					# Read current data (encrypted or plaintext, doesn't matter)
@@ -6,18 +6,51 @@ import uuid
 import shutil
 import time
 import tempfile
+import threading
+import queue
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, List, Any, IO
+from typing import Optional, Dict, List, Any, IO, Iterator, Tuple
 
 from .crypto import VaultCrypto
 from .partition import FilePartitioner
+from .pipeline import pipe
 from .config import VaultConfig, VaultConfigManager
 
+try:
+	from blake3 import blake3
+except ImportError:
+	blake3 = None
+
 logger = logging.getLogger(__name__)
 
+# Fills meta_index from the metadata of {node}. Object members become
+# dotted keys ($.artist."full name" -> artist.full name); containers and
+# nulls are recorded without a value so they still show up as keys.
+SQL_INDEX_METADATA = """
+	INSERT INTO meta_index (node_uuid, key, value, type)
+	SELECT {node}.uuid, replace(substr(m.fullkey, 3), '"', ''),
+		CASE WHEN m.type IN ('object', 'array', 'null') THEN NULL ELSE m.atom END, m.type
+	FROM {tables}json_tree(CASE WHEN json_valid({node}.metadata) THEN {node}.metadata END) m
+	WHERE m.parent IS NOT NULL AND m.fullkey NOT GLOB '*[[]*';
+"""
+
+# Nodes whose metadata holds `value` at the dotted `key`, via meta_index
+SQL_META_INDEX_MATCH = "SELECT node_uuid FROM meta_index WHERE key = ? AND value = ?"
+
 
 class DLFI:
+	# Idle read connections kept open between requests
+	READ_POOL_SIZE = 8
+	# Prepared statements kept per connection. Query endpoints build many
+	# distinct SQL strings; a large cache keeps the fixed API statements
+	# from being evicted between requests.
+	STATEMENT_CACHE_SIZE = 512
+	# Blobs whose ext and size are kept in memory by blob_info()
+	BLOB_INFO_CACHE_SIZE = 4096
+
 	def __init__(self, archive_root: str, password: Optional[str] = None):
 		"""
 		Initialize the Archive System.
@@ -63,12 +96,39 @@ class DLFI:
 		# Initialize partitioner
 		self.partitioner = FilePartitioner(chunk_size=self.config.partition_size)
 		
+		# Content hash for new blobs. Existing blobs keep the algorithm recorded
+		# in their row; BLAKE3 needs the optional blake3 package.
+		self.hash_algo = self.config.hash_algo
+		if self.hash_algo == "blake3" and blake3 is None:
+			logger.warning("blake3 not installed, hashing new blobs with sha256")
+			self.hash_algo = "sha256"
+		
 		# Connect to DB
 		self.conn = self._get_connection()
 		self._initialize_schema()
 		
 		# Config manager for runtime changes
 		self._config_manager = None
+		
+		# Nesting depth of transaction() blocks, guarded by _write_lock
+		self._tx_depth = 0
+		self._write_lock = threading.RLock()
+		
+		# Number of transaction() blocks committed so far. Bumped only once
+		# the commit has landed, so it never runs ahead of what read_conn()
+		# connections can see.
+		self.commit_count = 0
+		
+		# Idle read-only connections handed out by read_conn(); most recently
+		# used first, so a quiet server keeps reusing one warm connection
+		self._read_pool: queue.LifoQueue = queue.LifoQueue(maxsize=self.READ_POOL_SIZE)
+		self._closed = False
+		
+		# (ext, size_bytes) of blobs looked up so far, see blob_info
+		self._blob_info: Dict[str, Tuple[Optional[str], int]] = {}
+		
+		# Identifies this open handle, e.g. for HTTP cache validators
+		self.instance_id = uuid.uuid4().hex
 
 	def _initialize_structure(self):
 		"""Creates the archive structure if it doesn't exist."""
@@ -87,12 +147,72 @@ class DLFI:
 
 	def _get_connection(self) -> sqlite3.Connection:
 		"""Returns a tuned SQLite connection."""
-		conn = sqlite3.connect(self.db_path, check_same_thread=False)
+		conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=self.STATEMENT_CACHE_SIZE)
 		conn.execute("PRAGMA journal_mode=WAL;")
 		conn.execute("PRAGMA synchronous=NORMAL;")
 		conn.execute("PRAGMA foreign_keys=ON;")
+		self._tune_reads(conn)
 		return conn
 
+	@staticmethod
+	def _tune_reads(conn: sqlite3.Connection):
+		"""Sizes the caches that keep repeated lookups off the disk."""
+		conn.execute("PRAGMA cache_size=-65536;")    # 64 MiB page cache, filled on demand
+		conn.execute("PRAGMA mmap_size=268435456;")  # Read up to 256 MiB through mmap
+		conn.execute("PRAGMA temp_store=MEMORY;")    # Sorts and DISTINCT stay in memory
+
+	@contextmanager
+	def read_conn(self) -> Iterator[sqlite3.Connection]:
+		"""
+		Check out a read-only connection for the duration of the block.
+		Statements on the shared `conn` run one at a time; with WAL, separate
+		connections read in parallel and don't wait for a writer to commit.
+		Reads here only see committed data. Connections are opened on demand
+		and up to READ_POOL_SIZE idle ones are kept for reuse.
+		"""
+		try:
+			conn = self._read_pool.get_nowait()
+		except queue.Empty:
+			conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=self.STATEMENT_CACHE_SIZE)
+			conn.execute("PRAGMA query_only=ON;")
+			self._tune_reads(conn)
+		try:
+			yield conn
+		finally:
+			if self._closed:
+				conn.close()
+			else:
+				try:
+					self._read_pool.put_nowait(conn)
+				except queue.Full:
+					conn.close()
+
+	@contextmanager
+	def transaction(self):
+		"""
+		Group writes into a single commit.
+		Nested blocks join the outermost one, so callers batching many writes
+		(e.g. a multi-file upload) pay for one commit instead of one per write.
+		The connection is shared between server threads, so a writer on
+		another thread waits until the outermost block has committed.
+		"""
+		with self._write_lock:
+			if self._tx_depth:
+				self._tx_depth += 1
+				try:
+					yield
+				finally:
+					self._tx_depth -= 1
+				return
+			
+			self._tx_depth = 1
+			try:
+				with self.conn:
+					yield
+				self.commit_count += 1
+			finally:
+				self._tx_depth = 0
+
 	def _initialize_schema(self):
 		"""Creates the Database Tables with Indices for performance."""
 		with self.conn:
@@ -110,8 +230,11 @@ class DLFI:
 					FOREIGN KEY(parent_uuid) REFERENCES nodes(uuid) ON DELETE CASCADE
 				);
 			""")
-			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_parent ON nodes(parent_uuid);")
-			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_path ON nodes(cached_path);")
+			# Children in display order straight off the index; cached_path
+			# lookups use the UNIQUE constraint's own index
+			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_children ON nodes(parent_uuid, type DESC, name);")
+			self.conn.execute("DROP INDEX IF EXISTS idx_nodes_parent;")
+			self.conn.execute("DROP INDEX IF EXISTS idx_nodes_path;")
 
 			# 2. BLOBS (Physical Files - Deduplicated)
 			self.conn.execute("""
@@ -120,9 +243,14 @@ class DLFI:
 					ext TEXT,
 					size_bytes INTEGER,
 					storage_path TEXT,
-					part_count INTEGER DEFAULT 0
+					part_count INTEGER DEFAULT 0,
+					hash_algo TEXT DEFAULT 'sha256'
 				);
 			""")
+			# Vaults created before hash_algo was recorded
+			columns = {row[1] for row in self.conn.execute("PRAGMA table_info(blobs)")}
+			if "hash_algo" not in columns:
+				self.conn.execute("ALTER TABLE blobs ADD COLUMN hash_algo TEXT DEFAULT 'sha256'")
 
 			# 3. NODE_FILES (Linking Records to Blobs)
 			self.conn.execute("""
@@ -137,7 +265,12 @@ class DLFI:
 					FOREIGN KEY(file_hash) REFERENCES blobs(hash)
 				);
 			""")
-			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_node_files_node ON node_files(node_uuid);")
+			# Covers a node's file list in order without visiting the table
+			self.conn.execute("""
+				CREATE INDEX IF NOT EXISTS idx_node_files_order
+				ON node_files(node_uuid, display_order, file_hash, original_name);
+			""")
+			self.conn.execute("DROP INDEX IF EXISTS idx_node_files_node;")
 
 			# 4. EDGES (Relationships / Graph)
 			self.conn.execute("""
@@ -151,8 +284,10 @@ class DLFI:
 					FOREIGN KEY(target_uuid) REFERENCES nodes(uuid) ON DELETE CASCADE
 				);
 			""")
-			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_edges_source ON edges(source_uuid);")
-			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_edges_target ON edges(target_uuid);")
+			# The primary key covers outgoing edges; this covers incoming ones
+			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_edges_incoming ON edges(target_uuid, relation, source_uuid);")
+			self.conn.execute("DROP INDEX IF EXISTS idx_edges_source;")
+			self.conn.execute("DROP INDEX IF EXISTS idx_edges_target;")
 
 			# 5. TAGS (Primitive Tagging)
 			self.conn.execute("""
@@ -163,11 +298,72 @@ class DLFI:
 					FOREIGN KEY(node_uuid) REFERENCES nodes(uuid) ON DELETE CASCADE
 				);
 			""")
-			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag);")
+			# The primary key covers a node's tags; this covers nodes by tag
+			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tags_by_tag ON tags(tag, node_uuid);")
+			self.conn.execute("DROP INDEX IF EXISTS idx_tags_tag;")
+
+			# 6. META_INDEX (Flattened metadata for key/value lookups)
+			# One row per object member at any depth, keyed by its dotted
+			# path; members of arrays are not indexed. Kept in sync by
+			# triggers so every writer of nodes.metadata is covered.
+			indexed = self.conn.execute(
+				"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta_index'"
+			).fetchone()
+			self.conn.execute("""
+				CREATE TABLE IF NOT EXISTS meta_index (
+					node_uuid TEXT NOT NULL,
+					key TEXT NOT NULL,
+					value,
+					type TEXT,
+					FOREIGN KEY(node_uuid) REFERENCES nodes(uuid) ON DELETE CASCADE
+				);
+			""")
+			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_meta_index_key ON meta_index(key, value);")
+			self.conn.execute("CREATE INDEX IF NOT EXISTS idx_meta_index_node ON meta_index(node_uuid);")
+			self.conn.execute(f"""
+				CREATE TRIGGER IF NOT EXISTS nodes_meta_index_insert AFTER INSERT ON nodes
+				BEGIN
+					{SQL_INDEX_METADATA.format(node="NEW", tables="")}
+				END;
+			""")
+			self.conn.execute(f"""
+				CREATE TRIGGER IF NOT EXISTS nodes_meta_index_update AFTER UPDATE OF metadata ON nodes
+				BEGIN
+					DELETE FROM meta_index WHERE node_uuid = OLD.uuid;
+					{SQL_INDEX_METADATA.format(node="NEW", tables="")}
+				END;
+			""")
+			if not indexed:
+				# Vaults created before the index existed
+				self.conn.execute(SQL_INDEX_METADATA.format(node="nodes", tables="nodes, "))
+
+			# Give the planner statistics the first time a vault is opened
+			# with these indexes; PRAGMA optimize keeps them current after
+			analyzed = self.conn.execute(
+				"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+			).fetchone()
+			if not analyzed:
+				self.conn.execute("PRAGMA analysis_limit=1000;")
+				self.conn.execute("ANALYZE;")
 
 	def close(self):
-		"""Close the database connection."""
-		self.conn.close()
+		"""
+		Close the database connections.
+		Waits for a transaction open on another thread to commit first.
+		"""
+		with self._write_lock:
+			self._closed = True
+			while True:
+				try:
+					self._read_pool.get_nowait().close()
+				except queue.Empty:
+					break
+			try:
+				# Refresh planner statistics for tables whose shape has changed
+				self.conn.execute("PRAGMA optimize;")
+			except sqlite3.Error:
+				pass
+			self.conn.close()
 
 	@property
 	def config_manager(self) -> VaultConfigManager:
@@ -194,6 +390,12 @@ class DLFI:
 		"""Calculate SHA256 of bytes."""
 		return hashlib.sha256(data).hexdigest()
 
+	def _new_hasher(self):
+		"""Internal: Returns a fresh hasher for the vault's blob hash algorithm."""
+		if self.hash_algo == "blake3":
+			return blake3(max_threads=blake3.AUTO)
+		return hashlib.sha256()
+
 	# --- WRITE OPERATIONS: Vaults & Records ---
 
 	def create_vault(self, path: str, metadata: dict = None) -> str:
@@ -229,7 +431,9 @@ class DLFI:
 		with open(file_path, 'rb') as f:
 			plaintext = f.read()
 		
-		file_hash = self.get_bytes_hash(plaintext)
+		hasher = self._new_hasher()
+		hasher.update(plaintext)
+		file_hash = hasher.hexdigest()
 		file_size = len(plaintext)
 		
 		self._store_blob_and_link(node_uuid, file_hash, file_size, final_name, plaintext)
@@ -242,26 +446,108 @@ class DLFI:
 		if not node_uuid:
 			raise ValueError(f"Record not found: {record_path}")
 
-		# Stream to memory while hashing (for plaintext hash)
-		sha256 = hashlib.sha256()
-		chunks = []
+		file_hash, plaintext = self._read_stream(file_stream, filename)
+		self._store_blob_and_link(node_uuid, file_hash, len(plaintext), filename, plaintext)
+
+	def append_streams(self, record_path: str, streams: List[Tuple[IO[bytes], str]],
+						max_workers: int = 4) -> List[Optional[Exception]]:
+		"""
+		Appends several (stream, filename) pairs to a record.
+		Files are read and hashed max_workers at a time on a small thread pool,
+		outside any transaction, so other writers aren't held up by the
+		transfer. Each batch is then stored and linked, in the given order, in
+		one transaction; at most max_workers files are held in memory at a time.
+		Returns one entry per stream: None if stored, or the exception that
+		interrupted reading it.
+		"""
+		node_uuid = self._resolve_path(record_path, create_if_missing=False)
+		if not node_uuid:
+			raise ValueError(f"Record not found: {record_path}")
+
+		results = []
+		
+		def read(file_stream, filename):
+			try:
+				return self._read_stream(file_stream, filename)
+			except Exception as e:
+				return e
+		
+		with ThreadPoolExecutor(max_workers=max_workers) as pool:
+			for start in range(0, len(streams), max_workers):
+				batch = streams[start:start + max_workers]
+				outcomes = list(pool.map(read, *zip(*batch)))
+				
+				with self.transaction():
+					for outcome, (_, filename) in zip(outcomes, batch):
+						if isinstance(outcome, Exception):
+							results.append(outcome)
+							continue
+						file_hash, plaintext = outcome
+						self._store_blob_and_link(node_uuid, file_hash, len(plaintext), filename, plaintext)
+						results.append(None)
+				# Drop this batch's buffers before reading the next one
+				del outcomes
+		
+		return results
+
+	def _read_stream(self, file_stream: IO[bytes], filename: str) -> Tuple[str, bytearray]:
+		"""
+		Internal: Reads a stream into memory while hashing it.
+		Returns (plaintext hash, plaintext).
+		"""
+		hasher = self._new_hasher()
 		
 		try:
-			while True:
-				chunk = file_stream.read(65536)
-				if not chunk:
-					break
-				sha256.update(chunk)
-				chunks.append(chunk)
+			size = self._stream_size(file_stream)
+			if size is not None:
+				# Length known up front (spooled upload, local file): fill one
+				# buffer of the exact size instead of growing it chunk by chunk.
+				plaintext = self._read_sized(file_stream, size, hasher)
+			else:
+				# Reads run on a background thread so network and hashing overlap.
+				# Chunks are appended into one growing buffer, so the payload is
+				# never held twice (as a chunk list and as the joined result).
+				plaintext = bytearray()
+				
+				def consume(chunk: bytes):
+					hasher.update(chunk)
+					plaintext.extend(chunk)
+				
+				pipe(file_stream, consume)
 		except Exception as e:
 			logger.error(f"Stream interrupted for {filename}: {e}")
 			raise
 
-		plaintext = b''.join(chunks)
-		file_hash = sha256.hexdigest()
-		file_size = len(plaintext)
-		
-		self._store_blob_and_link(node_uuid, file_hash, file_size, filename, plaintext)
+		return hasher.hexdigest(), plaintext
+
+	@staticmethod
+	def _stream_size(file_stream: IO[bytes]) -> Optional[int]:
+		"""Internal: Bytes left in a seekable stream, or None if it can't be known cheaply."""
+		try:
+			if not (file_stream.seekable() and hasattr(file_stream, "readinto")):
+				return None
+			pos = file_stream.tell()
+			end = file_stream.seek(0, os.SEEK_END)
+			file_stream.seek(pos)
+			return end - pos
+		except (AttributeError, OSError, ValueError):
+			return None
+
+	@staticmethod
+	def _read_sized(file_stream: IO[bytes], size: int, hasher) -> bytearray:
+		"""Internal: readinto() a preallocated buffer, hashing each chunk in place."""
+		plaintext = bytearray(size)
+		offset = 0
+		with memoryview(plaintext) as view:
+			while offset < size:
+				n = file_stream.readinto(view[offset:offset + FilePartitioner.COPY_BUFFER_SIZE])
+				if not n:
+					break
+				hasher.update(view[offset:offset + n])
+				offset += n
+		# Stream ended early
+		del plaintext[offset:]
+		return plaintext
 
 	def _store_blob_and_link(self, node_uuid: str, file_hash: str, file_size: int, 
 							filename: str, plaintext: bytes):
@@ -271,7 +557,7 @@ class DLFI:
 		"""
 		ext = Path(filename).suffix.lower().lstrip('.')
 
-		with self.conn:
+		with self.transaction():
 			# Check if blob exists (deduplication by plaintext hash)
 			cursor = self.conn.execute("SELECT hash FROM blobs WHERE hash = ?", (file_hash,))
 			if not cursor.fetchone():
@@ -306,9 +592,9 @@ class DLFI:
 				# Insert blob record
 				rel_path = f"{shard_a}/{shard_b}/{file_hash}"
 				self.conn.execute("""
-					INSERT INTO blobs (hash, ext, size_bytes, storage_path, part_count)
-					VALUES (?, ?, ?, ?, ?)
-				""", (file_hash, ext, file_size, rel_path, part_count))
+					INSERT INTO blobs (hash, ext, size_bytes, storage_path, part_count, hash_algo)
+					VALUES (?, ?, ?, ?, ?, ?)
+				""", (file_hash, ext, file_size, rel_path, part_count, self.hash_algo))
 			else:
 				logger.debug(f"Deduplicated blob: {file_hash[:8]}...")
 
@@ -358,6 +644,106 @@ class DLFI:
 		
 		return data
 
+	def iter_blob(self, file_hash: str, chunk_size: int = FilePartitioner.COPY_BUFFER_SIZE,
+			start: int = 0, stop: Optional[int] = None) -> Optional[Iterator[bytes]]:
+		"""
+		Stream a blob's plaintext in chunks of at most chunk_size bytes.
+		Unencrypted blobs are read straight from disk (across parts), so memory
+		stays bounded regardless of blob size. Encrypted blobs are authenticated
+		as a whole by AES-GCM and are yielded as a single decrypted chunk.
+		Only bytes [start, stop) are produced; stop=None reads to the end.
+		Returns None if not found.
+		"""
+		if self.crypto.enabled:
+			data = self.read_blob(file_hash)
+			return None if data is None else iter((data[start:stop],))
+		
+		cursor = self.conn.execute(
+			"SELECT storage_path, part_count FROM blobs WHERE hash = ?", (file_hash,)
+		)
+		row = cursor.fetchone()
+		if not row:
+			return None
+		
+		storage_path, part_count = row
+		
+		if part_count > 0:
+			paths = FilePartitioner.get_part_files(self.storage_dir, file_hash)
+		else:
+			blob_path = self.storage_dir / storage_path
+			if not blob_path.exists():
+				return None
+			paths = [blob_path]
+		
+		return self._iter_files(paths, chunk_size, start, stop)
+
+	def blob_info(self, file_hash: str) -> Optional[Tuple[Optional[str], int]]:
+		"""
+		Returns (ext, size_bytes) of a stored blob, or None if there is none.
+		Both are fixed when the blob is first stored (re-partitioning or
+		re-encrypting only changes how it is kept), so repeat lookups for
+		the same hash are answered from memory.
+		"""
+		info = self._blob_info.get(file_hash)
+		if info is None:
+			with self.read_conn() as conn:
+				row = conn.execute(
+					"SELECT ext, size_bytes FROM blobs WHERE hash = ?", (file_hash,)
+				).fetchone()
+			if row is None:
+				return None
+			if len(self._blob_info) >= self.BLOB_INFO_CACHE_SIZE:
+				self._blob_info.clear()
+			info = self._blob_info[file_hash] = (row[0], row[1])
+		return info
+
+	def blob_file_path(self, file_hash: str) -> Optional[Path]:
+		"""
+		Path of the file holding a blob's plaintext, so callers can hand it to
+		the OS (e.g. sendfile) instead of copying it through Python.
+		Returns None when there is no such single file: the blob is missing,
+		partitioned, or stored encrypted.
+		"""
+		if self.crypto.enabled:
+			return None
+		
+		cursor = self.conn.execute(
+			"SELECT storage_path, part_count FROM blobs WHERE hash = ?", (file_hash,)
+		)
+		row = cursor.fetchone()
+		if not row or row[1] > 0:
+			return None
+		
+		blob_path = self.storage_dir / row[0]
+		return blob_path if blob_path.is_file() else None
+
+	@staticmethod
+	def _iter_files(paths: List[Path], chunk_size: int, start: int = 0, stop: Optional[int] = None) -> Iterator[bytes]:
+		"""
+		Yield bytes [start, stop) of the files' concatenated contents in
+		fixed-size chunks. Parts wholly before start are skipped unread.
+		"""
+		remaining = None if stop is None else stop - start
+		for path in paths:
+			if start:
+				size = os.path.getsize(path)
+				if start >= size:
+					start -= size
+					continue
+			with open(path, 'rb') as f:
+				if start:
+					f.seek(start)
+					start = 0
+				while remaining is None or remaining > 0:
+					chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+					if not chunk:
+						break
+					if remaining is not None:
+						remaining -= len(chunk)
+					yield chunk
+			if remaining == 0:
+				return
+
 	# --- Path Resolution ---
 
 	def _resolve_path(self, path: str, create_if_missing=False, node_type='VAULT', metadata=None) -> Optional[str]:
@@ -395,7 +781,7 @@ class DLFI:
 				actual_type = node_type if is_last else 'VAULT'
 				actual_meta = json.dumps(metadata) if (is_last and metadata) else None
 				
-				with self.conn:
+				with self.transaction():
 					self.conn.execute("""
 						INSERT INTO nodes (uuid, parent_uuid, type, name, cached_path, metadata, created_at, last_modified)
 						VALUES (?, ?, ?, ?, ?, ?, ?, ?)
@@ -419,7 +805,7 @@ class DLFI:
 		if not tgt_uuid: 
 			raise ValueError(f"Target path not found: {target_path}")
 
-		with self.conn:
+		with self.transaction():
 			self.conn.execute("""
 				INSERT OR REPLACE INTO edges (source_uuid, target_uuid, relation, created_at)
 				VALUES (?, ?, ?, ?)
@@ -431,7 +817,7 @@ class DLFI:
 		if not node_uuid: 
 			raise ValueError(f"Node not found: {path}")
 
-		with self.conn:
+		with self.transaction():
 			self.conn.execute("""
 				INSERT OR IGNORE INTO tags (node_uuid, tag)
 				VALUES (?, ?)
@@ -476,7 +862,15 @@ class QueryBuilder:
 		self.conditions = []
 		self.params = []
 		self.tables = ["nodes n"]
+		self.aliases = {"n"}
 		self.distinct = False
+		self._resolved: Dict[str, Optional[str]] = {}
+
+	def _resolve(self, path: str) -> Optional[str]:
+		"""Resolves a path once per builder; clauses often name the same target."""
+		if path not in self._resolved:
+			self._resolved[path] = self.db._resolve_path(path)
+		return self._resolved[path]
 
 	def inside(self, path_prefix: str):
 		clean = path_prefix.strip("/")
@@ -490,13 +884,22 @@ class QueryBuilder:
 		return self
 
 	def meta_eq(self, key: str, value: Any):
-		self.conditions.append(f"json_extract(n.metadata, '$.{key}') = ?")
-		self.params.append(value)
+		condition = f"json_extract(n.metadata, '$.{key}') = ?"
+		if "[" in key:
+			# meta_index leaves out array members
+			self.conditions.append(condition)
+			self.params.append(value)
+		else:
+			# Seek meta_index for candidates; json_extract keeps the exact
+			# match for keys that themselves contain dots
+			self.conditions.append(f"n.uuid IN ({SQL_META_INDEX_MATCH}) AND {condition}")
+			self.params.extend([key, value, value])
 		return self
 
 	def has_tag(self, tag: str):
-		if "tags t" not in self.tables:
+		if "t" not in self.aliases:
 			self.tables.append("JOIN tags t ON n.uuid = t.node_uuid")
+			self.aliases.add("t")
 		self.conditions.append("t.tag = ?")
 		self.params.append(tag.lower())
 		self.distinct = True
@@ -504,7 +907,7 @@ class QueryBuilder:
 
 	def related_to(self, target_path: str, relation: str = None):
 		"""Finds nodes that directly point to the target."""
-		target_uuid = self.db._resolve_path(target_path)
+		target_uuid = self._resolve(target_path)
 		if not target_uuid:
 			self.conditions.append("1=0")
 			return self
@@ -524,7 +927,7 @@ class QueryBuilder:
 
 	def contains_related(self, target_path: str, relation: str = None):
 		"""Finds Vaults containing any child related to the target."""
-		target_uuid = self.db._resolve_path(target_path)
+		target_uuid = self._resolve(target_path)
 		if not target_uuid:
 			self.conditions.append("1=0")
 			return self
@@ -550,13 +953,13 @@ class QueryBuilder:
 		return self
 
 	def execute(self) -> List[Dict]:
-		base = "SELECT DISTINCT n.uuid, n.cached_path, n.type, n.metadata FROM " if self.distinct else "SELECT n.uuid, n.cached_path, n.type, n.metadata FROM "
-		query_str = base + " ".join(self.tables)
-		
+		parts = ["SELECT DISTINCT" if self.distinct else "SELECT", "n.uuid, n.cached_path, n.type, n.metadata FROM"]
+		parts.extend(self.tables)
 		if self.conditions:
-			query_str += " WHERE " + " AND ".join(self.conditions)
-		
-		query_str += " ORDER BY n.cached_path ASC"
+			parts.append("WHERE")
+			parts.append(" AND ".join(self.conditions))
+		parts.append("ORDER BY n.cached_path ASC")
+		query_str = " ".join(parts)
 		
 		cursor = self.conn.execute(query_str, self.params)
 		results = []
@@ -77,11 +77,8 @@ class Job:
 class JobConfig:
 	cookies: Path = None
 
-	def __init__(self, cookies: str = None):
-		if cookies:
-			self.cookies = Path(cookies).resolve()
-		else:
-			self.cookies = None
+	def __post_init__(self):
+		self.cookies = Path(self.cookies).resolve() if self.cookies else None
 
 class JobResult:
 	def __init__(self, success: bool):
@@ -21,9 +21,7 @@ class DiscoveredFile:
 	"""
 	Represents a file to be ingested into the archive.
 	
-	You must provide either:
-	1. `local_path`: A path to a file already on disk (e.g. from a temp download).
-	2. `stream`: A file-like object (e.g. response.raw) to be read during ingestion.
+	`stream` is a file-like object (e.g. response.raw) read during ingestion.
 	"""
 	original_name: str       # e.g., "image.jpg"
 	source_url: str          # Where it came from (provenance)
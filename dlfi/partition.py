@@ -1,4 +1,5 @@
 import os
+from contextlib import ExitStack
 from pathlib import Path
 from typing import List, Generator, IO, Tuple
 import logging
@@ -9,17 +10,25 @@ logger = logging.getLogger(__name__)
 class FilePartitioner:
 	"""
 	Handles splitting large files into smaller chunks for GitHub compatibility.
-	Default chunk size is 50MB to stay well under GitHub's 100MB limit.
+	Default chunk size is 64MB to stay well under GitHub's 100MB limit.
+	Power-of-two chunk sizes take a shift instead of a division when counting parts.
 	"""
-	DEFAULT_CHUNK_SIZE = 50 * 1024 * 1024  # 50MB
+	DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024  # 64MB
 	MIN_CHUNK_SIZE = 1 * 1024 * 1024       # 1MB minimum
+	COPY_BUFFER_SIZE = 1 * 1024 * 1024     # 1MB read buffer for reassembly
 	
 	def __init__(self, chunk_size: int = None):
 		"""
 		Initialize partitioner.
 		:param chunk_size: Size in bytes. 0 or None = disabled.
 		"""
-		self._chunk_size = chunk_size if chunk_size else 0
+		self._set_chunk_size(chunk_size)
+	
+	def _set_chunk_size(self, value: int):
+		self._chunk_size = value if value else 0
+		# -1 marks a non power-of-two size that needs regular division
+		is_pow2 = self._chunk_size and not (self._chunk_size & (self._chunk_size - 1))
+		self._chunk_shift = self._chunk_size.bit_length() - 1 if is_pow2 else -1
 	
 	@property
 	def chunk_size(self) -> int:
@@ -29,7 +38,7 @@ class FilePartitioner:
 	def chunk_size(self, value: int):
 		if value and value < self.MIN_CHUNK_SIZE:
 			raise ValueError(f"Chunk size must be at least {self.MIN_CHUNK_SIZE} bytes")
-		self._chunk_size = value if value else 0
+		self._set_chunk_size(value)
 	
 	@property
 	def enabled(self) -> bool:
@@ -37,14 +46,14 @@ class FilePartitioner:
 	
 	def needs_partitioning(self, file_size: int) -> bool:
 		"""Check if a file needs to be split."""
-		if not self.enabled:
-			return False
-		return file_size > self._chunk_size
+		return 0 < self._chunk_size < file_size
 	
 	def get_part_count(self, file_size: int) -> int:
 		"""Calculate number of parts for a file."""
-		if not self.needs_partitioning(file_size):
+		if not 0 < self._chunk_size < file_size:
 			return 1
+		if self._chunk_shift >= 0:
+			return (file_size + self._chunk_size - 1) >> self._chunk_shift
 		return (file_size + self._chunk_size - 1) // self._chunk_size
 	
 	def split_bytes(self, data: bytes) -> List[bytes]:
@@ -69,23 +78,29 @@ class FilePartitioner:
 			return [base_name]
 		
 		parts = []
-		part_num = 1
+		buf = bytearray(self.COPY_BUFFER_SIZE)
+		view = memoryview(buf)
 		
 		with open(source_path, 'rb') as f:
-			while True:
-				chunk = f.read(self._chunk_size)
-				if not chunk:
-					break
-				
+			self._fadvise(f, 'POSIX_FADV_SEQUENTIAL')
+			for part_num in range(1, self.get_part_count(file_size) + 1):
 				part_name = f"{base_name}.{part_num:03d}"
 				part_path = dest_dir / part_name
 				
+				# Copy through a fixed buffer instead of holding a whole chunk in memory
+				remaining = self._chunk_size
 				with open(part_path, 'wb') as pf:
-					pf.write(chunk)
+					while remaining:
+						n = f.readinto(view[:min(remaining, len(buf))])
+						if not n:
+							break
+						pf.write(view[:n])
+						remaining -= n
 				
 				parts.append(part_name)
-				part_num += 1
 				logger.debug(f"Created partition: {part_name}")
+			# The source was only read, so its cached pages are clean and can be dropped
+			self._fadvise(f, 'POSIX_FADV_DONTNEED')
 		
 		logger.info(f"Split {source_path.name} into {len(parts)} parts")
 		return parts
@@ -100,14 +115,41 @@ class FilePartitioner:
 	
 	def reassemble_to_file(self, part_paths: List[Path], dest_path: Path):
 		"""Reassemble chunks into a single file."""
-		with open(dest_path, 'wb') as dest:
-			for part in sorted(part_paths, key=lambda p: p.name):
-				with open(part, 'rb') as src:
-					while True:
-						chunk = src.read(65536)
-						if not chunk:
-							break
-						dest.write(chunk)
+		# One reusable buffer for every part avoids a fresh bytes object per read
+		buf = bytearray(self.COPY_BUFFER_SIZE)
+		view = memoryview(buf)
+		ordered = sorted(part_paths, key=lambda p: p.name)
+		# Parts still open when a read or write fails are closed by the stack
+		with open(dest_path, 'wb') as dest, ExitStack() as opened:
+			def prefetch(path: Path) -> IO[bytes]:
+				f = opened.enter_context(open(path, 'rb'))
+				self._fadvise(f, 'POSIX_FADV_SEQUENTIAL', 'POSIX_FADV_WILLNEED')
+				return f
+			
+			# Open the next part ahead of time so the kernel can prefetch it
+			# while the current one is still being copied
+			nxt = prefetch(ordered[0]) if ordered else None
+			for i in range(len(ordered)):
+				src = nxt
+				nxt = prefetch(ordered[i + 1]) if i + 1 < len(ordered) else None
+				while True:
+					n = src.readinto(buf)
+					if not n:
+						break
+					dest.write(view[:n])
+				src.close()
+	
+	@staticmethod
+	def _fadvise(f: IO[bytes], *advice: str):
+		"""Pass access-pattern hints (os.POSIX_FADV_* names) for a whole file. No-op where unsupported."""
+		if not hasattr(os, 'posix_fadvise'):
+			return
+		try:
+			fd = f.fileno()
+			for name in advice:
+				os.posix_fadvise(fd, 0, 0, getattr(os, name))
+		except OSError:
+			pass
 	
 	def iter_stream_chunks(self, stream: IO[bytes]) -> Generator[bytes, None, None]:
 		"""Iterate over a stream in chunks."""
@@ -124,17 +166,23 @@ class FilePartitioner:
 		shard_b = file_hash[2:4]
 		blob_dir = storage_dir / shard_a / shard_b
 		
-		if not blob_dir.exists():
-			return []
-		
 		# Check for single file first
 		single = blob_dir / file_hash
-		if single.exists():
+		if os.path.exists(single):
 			return [single]
 		
 		# Check for partitioned files
-		parts = sorted(blob_dir.glob(f"{file_hash}.*"))
-		return [p for p in parts if p.suffix.lstrip('.').isdigit()]
+		prefix = file_hash + '.'
+		parts = []
+		try:
+			with os.scandir(blob_dir) as it:
+				for entry in it:
+					name = entry.name
+					if name.startswith(prefix) and name[len(prefix):].isdigit():
+						parts.append(Path(entry.path))
+		except FileNotFoundError:
+			return []
+		return sorted(parts, key=lambda p: p.name)
 	
 	@staticmethod
 	def parse_part_info(filename: str) -> Tuple[str, int]:
@@ -142,8 +190,11 @@ class FilePartitioner:
 		Parse a partition filename.
 		Returns (base_hash, part_number) or (base_hash, 0) if not partitioned.
 		"""
-		if '.' in filename:
-			parts = filename.rsplit('.', 1)
-			if parts[1].isdigit():
-				return parts[0], int(parts[1])
+		dot = filename.rfind('.')
+		if dot == -1:
+			return filename, 0
+		# int() alone would also take signs, spaces, underscores and non-ASCII digits
+		suffix = filename[dot + 1:]
+		if suffix.isascii() and suffix.isdigit():
+			return filename[:dot], int(suffix)
 		return filename, 0
\ No newline at end of file
@@ -0,0 +1,57 @@
+import queue
+import threading
+from typing import Callable, IO
+import logging
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def pipe(reader: IO[bytes], writer: Callable[[bytes], None], chunk_size: int = 1 << 20, depth: int = 4) -> int:
+	"""
+	Copy a stream into a writer callback, reading on a background thread.
+	Network reads and disk/hash work overlap; the bounded queue of `depth`
+	chunks provides backpressure so a slow writer doesn't buffer the whole stream.
+	Exceptions from either side are re-raised in the calling thread.
+	Returns the number of bytes copied.
+	"""
+	chunks: queue.Queue = queue.Queue(maxsize=depth)
+	stop = threading.Event()
+	errors = []
+
+	def produce():
+		try:
+			while not stop.is_set():
+				chunk = reader.read(chunk_size)
+				if not chunk:
+					break
+				chunks.put(chunk)
+		except BaseException as e:
+			errors.append(e)
+		finally:
+			chunks.put(_DONE)
+
+	producer = threading.Thread(target=produce, name="dlfi-pipe-reader", daemon=True)
+	producer.start()
+
+	total = 0
+	try:
+		while True:
+			chunk = chunks.get()
+			if chunk is _DONE:
+				break
+			writer(chunk)
+			total += len(chunk)
+	except BaseException:
+		# Unblock the producer so it can exit, then drop whatever it queued
+		stop.set()
+		while chunks.get() is not _DONE:
+			pass
+		raise
+	finally:
+		producer.join()
+
+	if errors:
+		raise errors[0]
+	return total
@@ -44,57 +44,53 @@ class StaticSiteGenerator:
 		for row in cursor:
 			uuid_to_path[row[0]] = row[1]
 		
+		# Tags, relationships and files are each read in one pass and grouped
+		# by node, rather than queried separately for every node
+		tags_by_node: Dict[str, List[str]] = {}
+		for n_uuid, tag in self.dlfi.conn.execute(
+			"SELECT node_uuid, tag FROM tags ORDER BY node_uuid, tag"
+		):
+			tags_by_node.setdefault(n_uuid, []).append(tag)
+		
+		rels_by_node: Dict[str, List[dict]] = {}
+		for src_uuid, tgt_uuid, rel_name in self.dlfi.conn.execute(
+			"SELECT source_uuid, target_uuid, relation FROM edges ORDER BY source_uuid, target_uuid, relation"
+		):
+			tgt_path = uuid_to_path.get(tgt_uuid, "UNKNOWN")
+			rels_by_node.setdefault(src_uuid, []).append({"relation": rel_name, "target": tgt_path})
+		
+		files_by_node: Dict[str, List[dict]] = {}
+		files_cur = self.dlfi.conn.execute("""
+			SELECT nf.node_uuid, nf.original_name, nf.file_hash, b.size_bytes, b.ext
+			FROM node_files nf
+			JOIN blobs b ON nf.file_hash = b.hash
+			ORDER BY nf.node_uuid, nf.display_order, nf.id
+		""")
+		for n_uuid, orig_name, file_hash, size_bytes, ext in files_cur:
+			files_by_node.setdefault(n_uuid, []).append({
+				"name": orig_name,
+				"hash": file_hash,
+				"size": size_bytes,
+				"ext": ext
+			})
+		
 		# Fetch all nodes with their data
 		nodes_cursor = self.dlfi.conn.execute(
 			"SELECT uuid, type, name, cached_path, metadata, parent_uuid FROM nodes"
 		)
 		
 		for n_uuid, n_type, n_name, n_path, n_meta, n_parent in nodes_cursor:
-			node_data = {
+			manifest["nodes"][n_uuid] = {
 				"uuid": n_uuid,
 				"type": n_type,
 				"name": n_name,
 				"path": n_path,
 				"parent": n_parent,
-				"metadata": json.loads(n_meta) if n_meta else {}
+				"metadata": json.loads(n_meta) if n_meta else {},
+				"tags": tags_by_node.get(n_uuid, []),
+				"relationships": rels_by_node.get(n_uuid, []),
+				"files": files_by_node.get(n_uuid, [])
 			}
-			
-			# Fetch tags
-			tags_cur = self.dlfi.conn.execute(
-				"SELECT tag FROM tags WHERE node_uuid = ?", (n_uuid,)
-			)
-			node_data["tags"] = [r[0] for r in tags_cur]
-			
-			# Fetch relationships
-			rels = []
-			edges_cur = self.dlfi.conn.execute(
-				"SELECT target_uuid, relation FROM edges WHERE source_uuid = ?", (n_uuid,)
-			)
-			for tgt_uuid, rel_name in edges_cur:
-				tgt_path = uuid_to_path.get(tgt_uuid, "UNKNOWN")
-				rels.append({"relation": rel_name, "target": tgt_path})
-			node_data["relationships"] = rels
-			
-			# Fetch files
-			files = []
-			files_cur = self.dlfi.conn.execute("""
-				SELECT nf.original_name, nf.file_hash, b.size_bytes, b.ext
-				FROM node_files nf
-				JOIN blobs b ON nf.file_hash = b.hash
-				WHERE nf.node_uuid = ?
-				ORDER BY nf.display_order
-			""", (n_uuid,))
-			
-			for orig_name, file_hash, size_bytes, ext in files_cur:
-				files.append({
-					"name": orig_name,
-					"hash": file_hash,
-					"size": size_bytes,
-					"ext": ext
-				})
-			node_data["files"] = files
-			
-			manifest["nodes"][n_uuid] = node_data
 		
 		# Blob partition info
 		blobs_cursor = self.dlfi.conn.execute(
@@ -115,7 +111,8 @@ class StaticSiteGenerator:
 	
 	def _write_manifest(self, manifest: dict):
 		"""Write manifest to file (encrypted if vault is encrypted)."""
-		manifest_json = json.dumps(manifest, indent=2, ensure_ascii=False)
+		# Compact: the viewer downloads and parses this whole file on load
+		manifest_json = json.dumps(manifest, separators=(',', ':'), ensure_ascii=False)
 		manifest_path = self.dlfi.root / "manifest.json"
 		
 		if self.dlfi.crypto.enabled:
@@ -695,13 +692,20 @@ class StaticSiteGenerator:
 		let manifest = null;
 		let cryptoKey = null;
 		
+		const IMAGE_EXTS = new Set(['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp']);
+		const VIDEO_EXTS = new Set(['mp4', 'webm', 'mov', 'avi']);
+		
 		// Utility functions
 		function formatSize(bytes) {
-			if (bytes === 0) return '0 B';
-			const k = 1024;
-			const sizes = ['B', 'KB', 'MB', 'GB'];
-			const i = Math.floor(Math.log(bytes) / Math.log(k));
-			return parseFloat((bytes / Math.pow(k, i)).toFixed(2)) + ' ' + sizes[i];
+			if (!bytes) return '0 B';
+			const sizes = ['B', 'KB', 'MB', 'GB', 'TB'];
+			let value = bytes;
+			let i = 0;
+			while (value >= 1024 && i < sizes.length - 1) {
+				value /= 1024;
+				i++;
+			}
+			return parseFloat(value.toFixed(2)) + ' ' + sizes[i];
 		}
 		
 		function getBlobPath(hash) {
@@ -938,8 +942,8 @@ class StaticSiteGenerator:
 					card.className = 'file-card';
 					
 					const blobInfo = manifest.blobs[file.hash] || { parts: 0 };
-					const isImage = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'].includes(file.ext);
-					const isVideo = ['mp4', 'webm', 'mov', 'avi'].includes(file.ext);
+					const isImage = IMAGE_EXTS.has(file.ext);
+					const isVideo = VIDEO_EXTS.has(file.ext);
 					
 					card.innerHTML = `
 						<div class="file-preview">
@@ -1019,8 +1023,8 @@ class StaticSiteGenerator:
 			const url = URL.createObjectURL(blob);
 			const content = document.getElementById('lightboxContent');
 			
-			const isImage = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'].includes(file.ext);
-			const isVideo = ['mp4', 'webm', 'mov', 'avi'].includes(file.ext);
+			const isImage = IMAGE_EXTS.has(file.ext);
+			const isVideo = VIDEO_EXTS.has(file.ext);
 			
 			if (isImage) {
 				content.innerHTML = `<img src="${url}" alt="${file.name}">`;
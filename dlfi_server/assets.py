@@ -0,0 +1,139 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from flask import Response, abort, request
+from werkzeug.security import safe_join
+
+try:
+	import brotli
+except ImportError:
+	brotli = None
+
+try:
+	import rcssmin
+except ImportError:
+	rcssmin = None
+
+# Types worth compressing; images and video are already compressed
+COMPRESSIBLE_TYPES = {"text/css", "text/javascript", "application/javascript", "text/html", "image/svg+xml", "application/json"}
+
+# Cache lifetime for URLs carrying the current content hash
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+
+@dataclass
+class Asset:
+	"""A static file held in memory with its precompressed variants."""
+	version: str
+	mimetype: str
+	mtime: float
+	body: bytes
+	gzip: Optional[bytes] = None
+	brotli: Optional[bytes] = None
+
+
+class StaticAssets:
+	"""
+	Serves the static folder from memory.
+	Each file is read, minified (CSS, when rcssmin is installed) and
+	compressed (gzip -9, brotli -q 11 when installed) once. URLs built
+	with url_for('static', ...) carry a content hash, so browsers can cache
+	them forever and refetch only when the file changes.
+	"""
+	
+	def __init__(self, static_dir: Path, reload: bool = False, minify: Optional[bool] = None):
+		self.static_dir = Path(static_dir)
+		self.reload = reload  # Re-check mtimes on every request (debug)
+		self.minify = (not reload) if minify is None else minify  # Debug serves readable sources
+		self._assets: Dict[str, Asset] = {}
+	
+	def get(self, filename: str) -> Optional[Asset]:
+		"""Load (or return the cached) asset for a path inside the static dir."""
+		asset = self._assets.get(filename)
+		if asset is not None and not self.reload:
+			return asset
+		
+		path = safe_join(str(self.static_dir), filename)
+		if path is None or not os.path.isfile(path):
+			return None
+		
+		mtime = os.path.getmtime(path)
+		if asset is not None and asset.mtime == mtime:
+			return asset
+		
+		with open(path, 'rb') as f:
+			body = f.read()
+		
+		mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+		if self.minify:
+			body = self._minify(body, mimetype)
+		asset = Asset(
+			version=hashlib.sha256(body).hexdigest()[:12],
+			mimetype=mimetype,
+			mtime=mtime,
+			body=body
+		)
+		if mimetype in COMPRESSIBLE_TYPES:
+			asset.gzip = gzip.compress(body, 9)
+			if brotli is not None:
+				asset.brotli = brotli.compress(body, quality=11)
+		
+		self._assets[filename] = asset
+		return asset
+	
+	@staticmethod
+	def _minify(body: bytes, mimetype: str) -> bytes:
+		"""
+		Strip comments and whitespace from CSS; other types pass through.
+		JS is left alone: the regex-based minifiers available without Node
+		collapse whitespace inside template literals, which the UI relies on.
+		"""
+		if mimetype == "text/css" and rcssmin is not None:
+			return rcssmin.cssmin(body)
+		return body
+	
+	def version(self, filename: str) -> Optional[str]:
+		"""Content hash for cache-busting URLs, or None if the file doesn't exist."""
+		asset = self.get(filename)
+		return asset.version if asset else None
+	
+	def url_defaults(self, endpoint: str, values: dict):
+		"""Flask url_defaults hook: append ?v=<hash> to static URLs."""
+		if endpoint == "static" and "filename" in values and "v" not in values:
+			version = self.version(values["filename"])
+			if version:
+				values["v"] = version
+	
+	def serve(self, filename: str) -> Response:
+		"""View function for the static endpoint."""
+		asset = self.get(filename)
+		if asset is None:
+			abort(404)
+		
+		if request.if_none_match.contains_weak(asset.version):
+			response = Response(status=304)
+		else:
+			accepted = request.accept_encodings
+			if asset.brotli is not None and accepted["br"]:
+				response = Response(asset.brotli, mimetype=asset.mimetype)
+				response.headers["Content-Encoding"] = "br"
+			elif asset.gzip is not None and accepted["gzip"]:
+				response = Response(asset.gzip, mimetype=asset.mimetype)
+				response.headers["Content-Encoding"] = "gzip"
+			else:
+				response = Response(asset.body, mimetype=asset.mimetype)
+		
+		response.set_etag(asset.version)
+		if asset.gzip is not None:
+			response.vary.add("Accept-Encoding")
+		# Only URLs naming the current version may be cached indefinitely
+		if request.args.get("v") == asset.version:
+			response.headers["Cache-Control"] = IMMUTABLE_CACHE
+		else:
+			response.headers["Cache-Control"] = "no-cache"
+		return response
@@ -0,0 +1,88 @@
+import gzip
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Response, request
+
+try:
+	import brotli
+except ImportError:
+	brotli = None
+
+# Smaller bodies aren't worth the CPU or the extra header
+MIN_COMPRESS_SIZE = 1024
+
+
+def negotiate_encoding() -> Optional[str]:
+	"""Pick the content encoding for the current request, or None."""
+	accepted = request.accept_encodings
+	if brotli is not None and accepted["br"]:
+		return "br"
+	if accepted["gzip"]:
+		return "gzip"
+	return None
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+	"""Compress a whole body with an encoding from negotiate_encoding()."""
+	if encoding == "br":
+		return brotli.compress(data, quality=4)
+	return gzip.compress(data, compresslevel=1)
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+	"""Compress a streamed body chunk by chunk, flushing after each one."""
+	if encoding == "br":
+		compressor = brotli.Compressor(quality=4)
+		for chunk in chunks:
+			out = compressor.process(chunk) + compressor.flush()
+			if out:
+				yield out
+		yield compressor.finish()
+	else:
+		compressor = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+		for chunk in chunks:
+			out = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+			if out:
+				yield out
+		yield compressor.flush()
+
+
+def compress_response(response: Response) -> Response:
+	"""
+	after_request hook: compress JSON bodies for clients that accept it.
+	Uses brotli (quality 4) when installed, else gzip at level 1; both run
+	close to memory speed while shrinking node lists several times over.
+	Streamed JSON is compressed as it is sent; file responses such as
+	blobs pass through untouched.
+	"""
+	if (response.direct_passthrough
+			or response.mimetype != "application/json"
+			or response.status_code in (204, 304)
+			or "Content-Encoding" in response.headers):
+		return response
+	
+	response.vary.add("Accept-Encoding")
+	
+	if response.is_streamed:
+		encoding = negotiate_encoding()
+		if encoding is None:
+			return response
+		response.response = compress_stream(response.response, encoding)
+	else:
+		data = response.get_data()
+		if len(data) < MIN_COMPRESS_SIZE:
+			return response
+		encoding = negotiate_encoding()
+		if encoding is None:
+			return response
+		response.set_data(compress_bytes(data, encoding))
+	
+	response.headers["Content-Encoding"] = encoding
+	
+	# The encoded body is a different representation of the same version
+	etag, weak = response.get_etag()
+	if etag and not weak:
+		response.set_etag(etag, weak=True)
+	
+	return response
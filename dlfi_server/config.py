@@ -17,6 +17,10 @@ class ServerConfig:
 	secret_key: str = field(default_factory=lambda: os.urandom(24).hex())
 	default_vaults_dir: Path = None
 	max_upload_size: int = 100 * 1024 * 1024  # 100MB
+	max_json_size: int = 8 * 1024 * 1024  # 8MB cap on JSON request bodies
+	max_form_parts: int = 1000  # Parts per multipart upload
+	threads: int = 8  # Worker threads when served by waitress
+	extractor_workers: int = 4  # Extractor jobs run at the same time
 	
 	def __post_init__(self):
 		# Set default vaults dir if not provided
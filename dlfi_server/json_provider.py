@@ -0,0 +1,115 @@
+import json
+from typing import Any, Iterable, Iterator, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
+
+def loads(s: Union[str, bytes]) -> Any:
+	"""
+	Parse JSON with orjson when installed. Documents orjson rejects but the
+	stdlib accepts (NaN written by json.dumps) fall back to the stdlib
+	parser. Unlike json.loads, integers beyond 64 bits come back as floats.
+	"""
+	if orjson is None:
+		return json.loads(s)
+	try:
+		return orjson.loads(s)
+	except orjson.JSONDecodeError:
+		return json.loads(s)
+
+
+def dumps(obj: Any) -> str:
+	"""
+	Serialize compactly for storage, with orjson when installed. Values
+	orjson can't encode (integers beyond 64 bits, ...) use the stdlib.
+	"""
+	if orjson is not None:
+		try:
+			return orjson.dumps(obj).decode()
+		except TypeError:
+			pass
+	return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def raw_json(s: str) -> Any:
+	"""
+	Wrap text that is already valid JSON (e.g. built by json_group_array)
+	so orjson embeds it in the output without parsing it first. Without
+	orjson.Fragment (orjson < 3.9 or no orjson) the text is parsed instead.
+	"""
+	if orjson is not None and hasattr(orjson, "Fragment"):
+		return orjson.Fragment(s)
+	return loads(s)
+
+
+# Streamed bodies are handed to the server in pieces of about this size
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def dumps_bytes(obj: Any) -> bytes:
+	"""Serialize compactly to UTF-8 bytes, with orjson when installed."""
+	if orjson is None:
+		return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+	return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def stream_object(obj: dict, key: str, items: Iterable[Any]) -> Iterator[bytes]:
+	"""
+	Serialize `obj` with `key` holding the list `items`, yielding the JSON
+	in chunks. Items are encoded one at a time, so a large list is never
+	held in memory as a single document and the server can start sending
+	before the last item is encoded.
+	"""
+	head = dumps_bytes(obj)[:-1]
+	buf = bytearray(head)
+	if obj:
+		buf += b","
+	buf += dumps_bytes(key) + b":["
+	
+	first = True
+	for item in items:
+		if not first:
+			buf += b","
+		buf += dumps_bytes(item)
+		first = False
+		if len(buf) >= STREAM_CHUNK_SIZE:
+			yield bytes(buf)
+			buf.clear()
+	
+	buf += b"]}\n"
+	yield bytes(buf)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+	"""
+	JSON provider backed by orjson. Serializes straight to bytes and
+	skips the str round-trip the stdlib encoder needs, which matters for
+	the large node lists and query results the API returns.
+	Falls back to the stdlib encoder when called with json.dumps-only
+	options (indent, separators, ...).
+	"""
+
+	available = orjson is not None
+
+	def dumps(self, obj: Any, **kwargs: Any) -> str:
+		if kwargs:
+			return super().dumps(obj, **kwargs)
+		return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+	def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+		if kwargs:
+			return super().loads(s, **kwargs)
+		return loads(s)
+
+	def response(self, *args: Any, **kwargs: Any):
+		if self.compact is False or (self.compact is None and self._app.debug):
+			# Keep the indented output in debug mode
+			return super().response(*args, **kwargs)
+		obj = self._prepare_response_obj(args, kwargs)
+		body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+		return self._app.response_class(body, mimetype=self.mimetype)
@@ -5,7 +5,6 @@ Provides intelligent autocomplete suggestions for the query language.
 """
 
 import re
-import json
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum, auto
@@ -75,13 +74,24 @@ class AutocompleteProvider:
 	
 	def __init__(self, dlfi_instance):
 		self.dlfi = dlfi_instance
-		self.conn = dlfi_instance.conn
 		self._cache = {}
+		self._version = None
+	
+	def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+		"""Run a lookup on a pooled read connection; the provider is shared between requests."""
+		with self.dlfi.read_conn() as conn:
+			return conn.execute(sql, params).fetchall()
 	
 	def invalidate_cache(self):
 		"""Invalidate the autocomplete cache."""
 		self._cache = {}
 	
+	def refresh(self, version: str):
+		"""Keep cached lookups only while the vault data is at `version`."""
+		if version != self._version:
+			self._cache = {}
+			self._version = version
+	
 	def get_suggestions(self, query: str, cursor_pos: int = None) -> List[Dict]:
 		"""
 		Get autocomplete suggestions for the current query.
@@ -334,8 +344,8 @@ class AutocompleteProvider:
 		
 		elif key_lower in ('inside', 'path'):
 			paths = self._get_all_paths()
-			for path in paths:
-				if not prefix or path.lower().startswith(prefix_lower):
+			for path, path_lower in zip(paths, self._lowered('paths', paths)):
+				if not prefix or path_lower.startswith(prefix_lower):
 					suggestions.append(Suggestion(
 						text=path, display=path, type=SuggestionType.PATH,
 						description="Path", insert_text=path, section="Paths"
@@ -378,10 +388,9 @@ class AutocompleteProvider:
 		
 		else:
 			# It's a metadata key (possibly nested) - suggest values
-			values = self._get_nested_metadata_values(key)
-			for val in values:
-				val_str = str(val)
-				if not prefix or val_str.lower().startswith(prefix_lower):
+			values = [str(val) for val in self._get_nested_metadata_values(key)]
+			for val_str, val_lower in zip(values, self._lowered(f'meta_values_{key}', values)):
+				if not prefix or val_lower.startswith(prefix_lower):
 					suggestions.append(Suggestion(
 						text=val_str, display=val_str, type=SuggestionType.METADATA_VALUE,
 						description=f"{key} value",
@@ -397,8 +406,8 @@ class AutocompleteProvider:
 		prefix_lower = prefix.lower()
 		paths = self._get_all_paths()
 		
-		for path in paths:
-			if not prefix or path.lower().startswith(prefix_lower):
+		for path, path_lower in zip(paths, self._lowered('paths', paths)):
+			if not prefix or path_lower.startswith(prefix_lower):
 				suggestions.append(Suggestion(
 					text=path,
 					display=path,
@@ -443,122 +452,89 @@ class AutocompleteProvider:
 	
 	# ============ Cache Methods ============
 	
+	def _lowered(self, name: str, items: List[str]) -> List[str]:
+		"""Lower-cased copy of the cached list `name`, built once per cache generation."""
+		cache_key = f'{name}_lower'
+		if cache_key not in self._cache:
+			self._cache[cache_key] = [item.lower() for item in items]
+		return self._cache[cache_key]
+	
 	def _get_all_tags(self) -> List[str]:
 		"""Get all unique tags."""
 		if 'tags' not in self._cache:
-			cursor = self.conn.execute("SELECT DISTINCT tag FROM tags ORDER BY tag LIMIT 100")
-			self._cache['tags'] = [row[0] for row in cursor]
+			rows = self._query("SELECT DISTINCT tag FROM tags ORDER BY tag LIMIT 100")
+			self._cache['tags'] = [row[0] for row in rows]
 		return self._cache['tags']
 	
 	def _get_all_extensions(self) -> List[str]:
 		"""Get all unique file extensions."""
 		if 'extensions' not in self._cache:
-			cursor = self.conn.execute("SELECT DISTINCT ext FROM blobs WHERE ext IS NOT NULL AND ext != '' ORDER BY ext LIMIT 50")
-			self._cache['extensions'] = [row[0] for row in cursor]
+			rows = self._query("SELECT DISTINCT ext FROM blobs WHERE ext IS NOT NULL AND ext != '' ORDER BY ext LIMIT 50")
+			self._cache['extensions'] = [row[0] for row in rows]
 		return self._cache['extensions']
 	
 	def _get_all_paths(self) -> List[str]:
 		"""Get all node paths."""
 		if 'paths' not in self._cache:
-			cursor = self.conn.execute("SELECT cached_path FROM nodes ORDER BY cached_path LIMIT 200")
-			self._cache['paths'] = [row[0] for row in cursor]
+			rows = self._query("SELECT cached_path FROM nodes ORDER BY cached_path LIMIT 200")
+			self._cache['paths'] = [row[0] for row in rows]
 		return self._cache['paths']
 	
 	def _get_all_relations(self) -> List[str]:
 		"""Get all unique relation types."""
 		if 'relations' not in self._cache:
-			cursor = self.conn.execute("SELECT DISTINCT relation FROM edges ORDER BY relation LIMIT 50")
-			self._cache['relations'] = [row[0] for row in cursor]
+			rows = self._query("SELECT DISTINCT relation FROM edges ORDER BY relation LIMIT 50")
+			self._cache['relations'] = [row[0] for row in rows]
 		return self._cache['relations']
 	
 	def _get_metadata_keys(self) -> List[str]:
 		"""Get all unique metadata keys."""
 		if 'meta_keys' not in self._cache:
-			keys = set()
-			cursor = self.conn.execute("SELECT metadata FROM nodes WHERE metadata IS NOT NULL AND metadata != '{}' LIMIT 500")
-			for row in cursor:
-				try:
-					meta = json.loads(row[0])
-					if isinstance(meta, dict):
-						keys.update(meta.keys())
-				except:
-					pass
-			self._cache['meta_keys'] = sorted(keys)[:50]
+			# meta_index joins nested keys with dots, but a top-level key can
+			# hold a dot too ("v1.2"); a dotted key is nested only if an object
+			# row of the same node is its prefix
+			rows = self._query("""
+				SELECT DISTINCT m.key FROM meta_index m
+				WHERE instr(m.key, '.') = 0 OR NOT EXISTS (
+					SELECT 1 FROM meta_index p
+					WHERE p.node_uuid = m.node_uuid AND p.type = 'object'
+						AND substr(m.key, 1, length(p.key) + 1) = p.key || '.'
+				)
+				ORDER BY m.key LIMIT 50
+			""")
+			self._cache['meta_keys'] = [row[0] for row in rows]
 		return self._cache['meta_keys']
 	
 	def _get_metadata_values(self, key: str) -> List[Any]:
 		"""Get all unique values for a metadata key."""
-		cache_key = f'meta_values_{key}'
-		if cache_key not in self._cache:
-			values = set()
-			cursor = self.conn.execute("SELECT metadata FROM nodes WHERE metadata IS NOT NULL LIMIT 500")
-			for row in cursor:
-				try:
-					meta = json.loads(row[0])
-					if isinstance(meta, dict) and key in meta:
-						val = meta[key]
-						if isinstance(val, (str, int, float, bool)):
-							values.add(val)
-				except:
-					pass
-			self._cache[cache_key] = sorted(values, key=lambda x: str(x))[:50]
-		return self._cache[cache_key]
+		return self._get_nested_metadata_values(key)
 
 	def _get_nested_metadata_keys(self, prefix: str = '') -> List[str]:
 		"""Get metadata keys including nested paths."""
 		if 'nested_meta_keys' not in self._cache:
-			keys = set()
-			cursor = self.conn.execute("SELECT metadata FROM nodes WHERE metadata IS NOT NULL AND metadata != '{}' LIMIT 500")
-			
-			def extract_keys(obj, path=''):
-				if isinstance(obj, dict):
-					for k, v in obj.items():
-						full_path = f"{path}.{k}" if path else k
-						keys.add(full_path)
-						if isinstance(v, dict):
-							extract_keys(v, full_path)
-			
-			for row in cursor:
-				try:
-					meta = json.loads(row[0])
-					if isinstance(meta, dict):
-						extract_keys(meta)
-				except:
-					pass
-			
-			self._cache['nested_meta_keys'] = sorted(keys)[:100]
+			rows = self._query("SELECT DISTINCT key FROM meta_index ORDER BY key LIMIT 100")
+			self._cache['nested_meta_keys'] = [row[0] for row in rows]
 
 		result = self._cache['nested_meta_keys']
 		if prefix:
-			result = [k for k in result if k.lower().startswith(prefix.lower())]
+			prefix_lower = prefix.lower()
+			lowered = self._lowered('nested_meta_keys', result)
+			result = [k for k, k_lower in zip(result, lowered) if k_lower.startswith(prefix_lower)]
 		return result
 
 	def _get_nested_metadata_values(self, key: str) -> List[Any]:
 		"""Get values for a metadata key (supports nested paths like 'artist.name')."""
 		cache_key = f'meta_values_{key}'
 		if cache_key not in self._cache:
-			values = set()
-			cursor = self.conn.execute("SELECT metadata FROM nodes WHERE metadata IS NOT NULL LIMIT 500")
-			
-			# Split key into path parts
-			parts = key.split('.')
-			
-			for row in cursor:
-				try:
-					meta = json.loads(row[0])
-					# Navigate to nested value
-					current = meta
-					for part in parts:
-						if isinstance(current, dict) and part in current:
-							current = current[part]
-						else:
-							current = None
-							break
-					
-					if current is not None and isinstance(current, (str, int, float, bool)):
-						values.add(current)
-				except:
-					pass
-			
-			self._cache[cache_key] = sorted(values, key=str)[:50]
+			rows = self._query("""
+				SELECT DISTINCT value, type FROM meta_index
+				WHERE key = ? AND value IS NOT NULL
+				ORDER BY CAST(value AS TEXT) LIMIT 50
+			""", (key,))
+			# Booleans are stored as 1/0; the JSON type tells them apart
+			values = {
+				(value_type == 'true') if value_type in ('true', 'false') else value
+				for value, value_type in rows
+			}
+			self._cache[cache_key] = sorted(values, key=str)
 		return self._cache[cache_key]
\ No newline at end of file
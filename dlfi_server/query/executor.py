@@ -4,11 +4,11 @@ DLFI Query Executor
 Executes parsed query AST against the database.
 """
 
-import json
 import logging
 from typing import List, Dict, Any, Optional, Set, Tuple
 from dataclasses import dataclass
 
+from ..json_provider import loads as json_loads, raw_json
 from .parser import (
 	AndGroup, OrGroup, Term, ASTNode,
 	TermType, Operator, Modifier
@@ -35,10 +35,26 @@ class QueryExecutor:
 	
 	def __init__(self, dlfi_instance):
 		self.dlfi = dlfi_instance
-		self.conn = dlfi_instance.conn
+		# Set to a pooled read connection while execute() runs
+		self.conn = None
+		# Relation targets resolved so far; queries often repeat a path
+		self._path_uuids: Dict[str, Optional[str]] = {}
 	
-	def execute(self, ast: AndGroup, offset: int = 0) -> QueryResult:
-		"""Execute a parsed query and return results."""
+	def execute(self, ast: AndGroup, offset: int = 0, fields: Optional[List[str]] = None) -> QueryResult:
+		"""
+		Execute a parsed query and return results.
+		When `fields` is given, each node's metadata holds only those keys
+		(dotted paths allowed), projected by SQLite instead of parsed whole.
+		"""
+		# Queries only read, so they don't need the shared write connection
+		with self.dlfi.read_conn() as conn:
+			self.conn = conn
+			try:
+				return self._execute(ast, offset, fields)
+			finally:
+				self.conn = None
+	
+	def _execute(self, ast: AndGroup, offset: int, fields: Optional[List[str]]) -> QueryResult:
 		import time
 		start_time = time.time()
 		
@@ -57,44 +73,71 @@ class QueryExecutor:
 		# Build and execute the query
 		where_clause, params = self._build_where(ast)
 		
-		# Count total results
-		count_sql = f"""
-			SELECT COUNT(DISTINCT n.uuid)
-			FROM nodes n
-			LEFT JOIN tags t ON n.uuid = t.node_uuid
-			LEFT JOIN node_files nf ON n.uuid = nf.node_uuid
-			LEFT JOIN blobs b ON nf.file_hash = b.hash
-			LEFT JOIN edges e ON n.uuid = e.source_uuid OR n.uuid = e.target_uuid
-			{where_clause}
-		"""
-		
-		cursor = self.conn.execute(count_sql, params)
-		total_count = cursor.fetchone()[0]
+		metadata_sql = "p.metadata"
+		field_params: List[Any] = []
+		if fields:
+			metadata_sql = "json_object({})".format(
+				", ".join("?, json_extract(p.metadata, ?)" for _ in fields)
+			)
+			for field in fields:
+				field_params.extend([field, f"$.{field}"])
 		
-		# Fetch results
+		# Everything in one statement: the filtered set of uuids is computed
+		# once, the window count reports the total alongside the page, and
+		# tags, file stats and child counts are only gathered for the rows
+		# that are actually returned.
 		select_sql = f"""
-			SELECT DISTINCT
-				n.uuid, n.type, n.name, n.cached_path, n.metadata,
-				n.parent_uuid, n.created_at, n.last_modified
-			FROM nodes n
-			LEFT JOIN tags t ON n.uuid = t.node_uuid
-			LEFT JOIN node_files nf ON n.uuid = nf.node_uuid
-			LEFT JOIN blobs b ON nf.file_hash = b.hash
-			LEFT JOIN edges e ON n.uuid = e.source_uuid OR n.uuid = e.target_uuid
-			{where_clause}
-			ORDER BY n.{sort_key} {sort_dir}
-			LIMIT ? OFFSET ?
+			WITH matches AS (
+				SELECT DISTINCT n.uuid
+				FROM nodes n
+				LEFT JOIN tags t ON n.uuid = t.node_uuid
+				LEFT JOIN node_files nf ON n.uuid = nf.node_uuid
+				LEFT JOIN blobs b ON nf.file_hash = b.hash
+				LEFT JOIN edges e ON n.uuid = e.source_uuid OR n.uuid = e.target_uuid
+				{where_clause}
+			),
+			page AS (
+				SELECT
+					n.uuid, n.type, n.name, n.cached_path, n.metadata,
+					n.parent_uuid, n.created_at, n.last_modified,
+					COUNT(*) OVER () AS total
+				FROM matches m
+				JOIN nodes n ON n.uuid = m.uuid
+				ORDER BY n.{sort_key} {sort_dir}
+				LIMIT ? OFFSET ?
+			)
+			SELECT
+				p.uuid, p.type, p.name, p.cached_path, {metadata_sql},
+				p.parent_uuid, p.created_at, p.last_modified, p.total,
+				(SELECT json_group_array(tag) FROM tags WHERE node_uuid = p.uuid),
+				(SELECT COUNT(*) FROM node_files nf JOIN blobs b ON nf.file_hash = b.hash
+					WHERE nf.node_uuid = p.uuid),
+				(SELECT COALESCE(SUM(b.size_bytes), 0) FROM node_files nf JOIN blobs b ON nf.file_hash = b.hash
+					WHERE nf.node_uuid = p.uuid),
+				CASE WHEN p.type = 'VAULT'
+					THEN (SELECT COUNT(*) FROM nodes c WHERE c.parent_uuid = p.uuid)
+					ELSE 0 END
+			FROM page p
+			ORDER BY p.{sort_key} {sort_dir}
 		"""
 		
-		cursor = self.conn.execute(select_sql, params + [limit, offset])
+		rows = self.conn.execute(select_sql, params + [limit, offset] + field_params).fetchall()
+		
+		nodes = [self._row_to_node(row) for row in rows]
+		total_count = rows[0][8] if rows else 0
 		
-		nodes = []
-		for row in cursor:
-			uuid, node_type, name, path, metadata, parent, created, modified = row
-			
-			# Get additional data
-			node_data = self._enrich_node(uuid, node_type, name, path, metadata, parent, created, modified)
-			nodes.append(node_data)
+		if not nodes and offset > 0:
+			# Paged past the end: the window count had no rows to ride on
+			count_sql = f"""
+				SELECT COUNT(DISTINCT n.uuid)
+				FROM nodes n
+				LEFT JOIN tags t ON n.uuid = t.node_uuid
+				LEFT JOIN node_files nf ON n.uuid = nf.node_uuid
+				LEFT JOIN blobs b ON nf.file_hash = b.hash
+				LEFT JOIN edges e ON n.uuid = e.source_uuid OR n.uuid = e.target_uuid
+				{where_clause}
+			"""
+			total_count = self.conn.execute(count_sql, params).fetchone()[0]
 		
 		query_time = (time.time() - start_time) * 1000
 		
@@ -106,29 +149,14 @@ class QueryExecutor:
 			query_time_ms=round(query_time, 2)
 		)
 	
-	def _enrich_node(self, uuid: str, node_type: str, name: str, path: str,
-					metadata: str, parent: str, created: float, modified: float) -> Dict:
-		"""Add tags, file count, etc. to node data."""
-		# Get tags
-		cursor = self.conn.execute("SELECT tag FROM tags WHERE node_uuid = ?", (uuid,))
-		tags = [r[0] for r in cursor]
-		
-		# Get file count and total size
-		cursor = self.conn.execute("""
-			SELECT COUNT(*), COALESCE(SUM(b.size_bytes), 0)
-			FROM node_files nf
-			JOIN blobs b ON nf.file_hash = b.hash
-			WHERE nf.node_uuid = ?
-		""", (uuid,))
-		file_count, total_size = cursor.fetchone()
-		
-		# Get child count for vaults
-		child_count = 0
-		if node_type == 'VAULT':
-			cursor = self.conn.execute(
-				"SELECT COUNT(*) FROM nodes WHERE parent_uuid = ?", (uuid,)
-			)
-			child_count = cursor.fetchone()[0]
+	@staticmethod
+	def _row_to_node(row: tuple) -> Dict:
+		"""
+		Convert a result row (node columns plus aggregates) to node data.
+		Tags stay as the JSON array SQLite built, see raw_json.
+		"""
+		(uuid, node_type, name, path, metadata, parent, created, modified,
+			_total, tags, file_count, total_size, child_count) = row
 		
 		return {
 			"uuid": uuid,
@@ -136,8 +164,8 @@ class QueryExecutor:
 			"name": name,
 			"path": path,
 			"parent": parent,
-			"metadata": json.loads(metadata) if metadata else {},
-			"tags": tags,
+			"metadata": json_loads(metadata) if metadata else {},
+			"tags": raw_json(tags),
 			"file_count": file_count,
 			"total_size": total_size,
 			"child_count": child_count,
@@ -300,7 +328,16 @@ class QueryExecutor:
 			json_path = f"$.{key}"
 		
 		if term.operator == Operator.EQUALS:
-			return f"json_extract(n.metadata, ?) = ?", [json_path, value]
+			if "[" in key or term.modifier.negated:
+				# Array members aren't in meta_index, and negation needs
+				# json_extract's NULL for a missing key to stay excluded
+				return f"json_extract(n.metadata, ?) = ?", [json_path, value]
+			# Candidates come from an index seek on meta_index rather than
+			# parsing every node's metadata; json_extract confirms the match
+			return f"""(
+				n.uuid IN (SELECT node_uuid FROM meta_index WHERE key = ? AND value = ?) AND
+				json_extract(n.metadata, ?) = ?
+			)""", [key, value, json_path, value]
 		
 		elif term.operator == Operator.CONTAINS:
 			return f"CAST(json_extract(n.metadata, ?) AS TEXT) LIKE ?", [json_path, f"%{value}%"]
@@ -335,10 +372,19 @@ class QueryExecutor:
 		else:
 			json_path = f"$.{key}"
 		
-		if term.operator == Operator.NOT_EXISTS:
-			return f"json_extract(n.metadata, ?) IS NULL", [json_path]
+		if "[" in key:
+			condition, params = "json_extract(n.metadata, ?) IS NOT NULL", [json_path]
 		else:
-			return f"json_extract(n.metadata, ?) IS NOT NULL", [json_path]
+			# meta_index has a row for every object member, null or not
+			condition = """(
+				n.uuid IN (SELECT node_uuid FROM meta_index WHERE key = ? AND type != 'null') AND
+				json_extract(n.metadata, ?) IS NOT NULL
+			)"""
+			params = [key, json_path]
+		
+		if term.operator == Operator.NOT_EXISTS:
+			return f"NOT {condition}", params
+		return condition, params
 	
 	def _build_inside_condition(self, term: Term) -> Tuple[str, List[Any]]:
 		"""Build path containment condition."""
@@ -364,16 +410,10 @@ class QueryExecutor:
 		relation = term.value
 		direction = term.modifier.direction
 		
-		# Get target UUID
-		cursor = self.conn.execute(
-			"SELECT uuid FROM nodes WHERE cached_path = ?", (target_path,)
-		)
-		row = cursor.fetchone()
-		if not row:
+		target_uuid = self._uuid_for_path(target_path)
+		if not target_uuid:
 			return "1=0", []  # No match
 		
-		target_uuid = row[0]
-		
 		conditions = []
 		params = []
 		
@@ -396,6 +436,15 @@ class QueryExecutor:
 		
 		return " AND ".join(conditions), params
 	
+	def _uuid_for_path(self, path: str) -> Optional[str]:
+		"""Look up a node's UUID by path, once per path for this query."""
+		if path not in self._path_uuids:
+			row = self.conn.execute(
+				"SELECT uuid FROM nodes WHERE cached_path = ?", (path,)
+			).fetchone()
+			self._path_uuids[path] = row[0] if row else None
+		return self._path_uuids[path]
+	
 	def _build_relation_type_condition(self, term: Term) -> Tuple[str, List[Any]]:
 		"""Build condition for finding nodes with a specific relation type."""
 		relation = str(term.value).upper()
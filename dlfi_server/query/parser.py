@@ -126,6 +126,27 @@ class AndGroup:
 ASTNode = Union[Term, OrGroup, AndGroup]
 
 
+OPERATOR_TOKENS = {
+	'>=': TokenType.GTE, '<=': TokenType.LTE, '**': TokenType.DOUBLESTAR,
+	'..': TokenType.RANGE, ':': TokenType.COLON, '=': TokenType.EQUALS,
+	'>': TokenType.GT, '<': TokenType.LT, '|': TokenType.OR,
+	'(': TokenType.LPAREN, ')': TokenType.RPAREN, '-': TokenType.NEGATE,
+	'^': TokenType.DEEP, '%': TokenType.REVERSE_DEEP, '!': TokenType.RELATION,
+	'?': TokenType.QUESTION, '*': TokenType.STAR,
+}
+
+# One alternative per token class; every character of a query falls into
+# exactly one, so finditer walks the whole string without gaps.
+_TOKEN_RE = re.compile(r'''
+	(?P<ws>\s+)
+	| (?P<quoted>"(?P<body>(?:\\.|\\\Z|[^"\\])*)"?)
+	| (?P<op>>=|<=|\*\*|\.\.|[:=><|()\-^%!?*])
+	| (?P<text>[^\s:=><|()!^%?*"]+)
+''', re.VERBOSE | re.DOTALL)
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+_NUMBER_RE = re.compile(r'^-?\d+(\.\d+)?$')
+
+
 class Lexer:
 	"""Tokenizes a query string."""
 	
@@ -142,137 +163,25 @@ class Lexer:
 	def tokenize(self) -> List[Token]:
 		"""Convert query string to tokens."""
 		self.tokens = []
-		self.pos = 0
 		
-		while self.pos < len(self.query):
-			self._skip_whitespace()
-			if self.pos >= len(self.query):
-				break
-			
-			char = self.query[self.pos]
-			
-			if char == '"':
-				self._read_quoted()
-			elif char == ':':
-				self._add_token(TokenType.COLON, ':')
-			elif char == '=':
-				self._add_token(TokenType.EQUALS, '=')
-			elif char == '>':
-				if self._peek(1) == '=':
-					self._add_token(TokenType.GTE, '>=')
-					self.pos += 1
-				else:
-					self._add_token(TokenType.GT, '>')
-			elif char == '<':
-				if self._peek(1) == '=':
-					self._add_token(TokenType.LTE, '<=')
-					self.pos += 1
-				else:
-					self._add_token(TokenType.LT, '<')
-			elif char == '|':
-				self._add_token(TokenType.OR, '|')
-			elif char == '(':
-				self._add_token(TokenType.LPAREN, '(')
-			elif char == ')':
-				self._add_token(TokenType.RPAREN, ')')
-			elif char == '-':
-				self._add_token(TokenType.NEGATE, '-')
-			elif char == '^':
-				self._add_token(TokenType.DEEP, '^')
-			elif char == '%':
-				self._add_token(TokenType.REVERSE_DEEP, '%')
-			elif char == '!':
-				self._add_token(TokenType.RELATION, '!')
-			elif char == '?':
-				self._add_token(TokenType.QUESTION, '?')
-			elif char == '*':
-				if self._peek(1) == '*':
-					self._add_token(TokenType.DOUBLESTAR, '**')
-					self.pos += 1
-				else:
-					self._add_token(TokenType.STAR, '*')
-			elif char == '.':
-				if self._peek(1) == '.':
-					self._add_token(TokenType.RANGE, '..')
-					self.pos += 1
-				else:
-					self._read_text()
-					continue  # _read_text advances pos
-			else:
-				self._read_text()
-				continue  # _read_text advances pos
+		for match in _TOKEN_RE.finditer(self.query):
+			kind = match.lastgroup
+			start = match.start()
+			text = match.group()
 			
-			self.pos += 1
-		
+			if kind == 'op':
+				self.tokens.append(Token(OPERATOR_TOKENS[text], text, start))
+			elif kind == 'quoted':
+				# An unclosed quote runs to the end of the query
+				value = _ESCAPE_RE.sub(r'\1', match.group('body'))
+				self.tokens.append(Token(TokenType.QUOTED, value, start))
+			elif kind == 'text':
+				token_type = TokenType.NUMBER if _NUMBER_RE.match(text) else TokenType.TEXT
+				self.tokens.append(Token(token_type, text, start))
+		
+		self.pos = len(self.query)
 		self.tokens.append(Token(TokenType.EOF, '', self.pos))
 		return self.tokens
-	
-	def _skip_whitespace(self):
-		while self.pos < len(self.query) and self.query[self.pos].isspace():
-			self.pos += 1
-	
-	def _peek(self, offset: int = 0) -> Optional[str]:
-		pos = self.pos + offset
-		if pos < len(self.query):
-			return self.query[pos]
-		return None
-	
-	def _add_token(self, type: TokenType, value: str):
-		self.tokens.append(Token(type, value, self.pos))
-	
-	def _read_quoted(self):
-		"""Read a quoted string."""
-		start = self.pos
-		self.pos += 1  # Skip opening quote
-		value = []
-		
-		while self.pos < len(self.query):
-			char = self.query[self.pos]
-			if char == '"':
-				self.tokens.append(Token(TokenType.QUOTED, ''.join(value), start))
-				return
-			elif char == '\\' and self.pos + 1 < len(self.query):
-				self.pos += 1
-				value.append(self.query[self.pos])
-			else:
-				value.append(char)
-			self.pos += 1
-		
-		# Unclosed quote - treat as text
-		self.tokens.append(Token(TokenType.QUOTED, ''.join(value), start))
-	
-	def _read_text(self):
-		"""Read plain text until a special character."""
-		start = self.pos
-		value = []
-		
-		special = set(':=><|()!^%?*"')
-		
-		while self.pos < len(self.query):
-			char = self.query[self.pos]
-			
-			if char.isspace() or char in special:
-				# Check for .. range operator
-				if char == '.' and self._peek(1) == '.':
-					break
-				if char not in special or char == '.':
-					if char.isspace():
-						break
-					value.append(char)
-					self.pos += 1
-					continue
-				break
-			
-			value.append(char)
-			self.pos += 1
-		
-		text = ''.join(value)
-		if text:
-			# Check if it's a number
-			if re.match(r'^-?\d+(\.\d+)?$', text):
-				self.tokens.append(Token(TokenType.NUMBER, text, start))
-			else:
-				self.tokens.append(Token(TokenType.TEXT, text, start))
 
 
 class QueryParser:
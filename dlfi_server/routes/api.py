@@ -1,11 +1,14 @@
-import json
 import logging
+import secrets
 import time
 from pathlib import Path
-from typing import Optional
-from flask import Blueprint, request, jsonify, current_app, Response
+from typing import Optional, Tuple
+from flask import Blueprint, request, jsonify, current_app, Response, send_file
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 from io import BytesIO
 from dlfi_server.query import QueryParser, QueryExecutor, AutocompleteProvider, ParseError
+from dlfi_server.compression import MIN_COMPRESS_SIZE, compress_bytes, negotiate_encoding
+from dlfi_server.json_provider import dumps as json_dumps, dumps_bytes, loads as json_loads, raw_json, stream_object
 from dlfi.config import VaultConfigManager
 
 logger = logging.getLogger(__name__)
@@ -13,6 +16,151 @@ logger = logging.getLogger(__name__)
 api_bp = Blueprint("api", __name__)
 
 
+# Statements issued on every tree load, node view and blob fetch. Sharing
+# the strings means sqlite3 prepares each once per connection and reuses
+# it from its statement cache.
+SQL_NODE_PATH = "SELECT cached_path FROM nodes WHERE uuid = ?"
+SQL_NODE_PATH_TYPE = "SELECT cached_path, type FROM nodes WHERE uuid = ?"
+SQL_NODE_UUID_BY_PATH = "SELECT uuid FROM nodes WHERE cached_path = ?"
+SQL_OUTGOING_EDGES = """
+	SELECT e.relation, e.target_uuid, n.cached_path, n.name, n.type
+	FROM edges e
+	JOIN nodes n ON e.target_uuid = n.uuid
+	WHERE e.source_uuid = ?
+"""
+SQL_INCOMING_EDGES = """
+	SELECT e.relation, e.source_uuid, n.cached_path, n.name, n.type
+	FROM edges e
+	JOIN nodes n ON e.source_uuid = n.uuid
+	WHERE e.target_uuid = ?
+"""
+SQL_FIRST_FILE = """
+	SELECT nf.file_hash, b.ext, b.size_bytes
+	FROM node_files nf
+	JOIN blobs b ON nf.file_hash = b.hash
+	WHERE nf.node_uuid = ?
+	ORDER BY nf.display_order
+	LIMIT 1
+"""
+
+# MIME types blobs are served inline with. Deliberately a short allowlist
+# rather than the mimetypes registry: anything else (html, svg, ...) is
+# sent as application/octet-stream so it can't render on this origin.
+BLOB_MIME_TYPES = {
+	"jpg": "image/jpeg",
+	"jpeg": "image/jpeg",
+	"png": "image/png",
+	"gif": "image/gif",
+	"webp": "image/webp",
+	"mp4": "video/mp4",
+	"webm": "video/webm",
+	"mov": "video/quicktime",
+	"pdf": "application/pdf",
+	"txt": "text/plain",
+}
+
+# Extensions the UI can preview; blob exts are stored lowercased
+PREVIEW_IMAGE_EXTS = frozenset({"jpg", "jpeg", "png", "gif", "webp", "bmp"})
+PREVIEW_VIDEO_EXTS = frozenset({"mp4", "webm", "mov"})
+
+# Blobs are addressed by content hash, so a given URL never changes
+BLOB_MAX_AGE = 31536000
+
+# Distinct query results kept for the current data version
+QUERY_CACHE_SIZE = 64
+
+# Finished extractor jobs kept for polling before the oldest are dropped
+MAX_FINISHED_JOBS = 50
+
+# Tags and file counts come from correlated subqueries on the indexed
+# foreign keys, so the whole listing is a single statement.
+SQL_LIST_NODES = """
+	SELECT n.uuid, n.type, n.name, n.cached_path, n.metadata, n.parent_uuid, n.created_at,
+		(SELECT json_group_array(t.tag) FROM tags t WHERE t.node_uuid = n.uuid),
+		(SELECT COUNT(*) FROM node_files nf WHERE nf.node_uuid = n.uuid)
+	FROM nodes n
+	ORDER BY n.cached_path
+"""
+
+# Compact tree listing: only what the tree view needs, returned as rows
+TREE_COLUMNS = ["uuid", "parent", "type", "name", "path", "file_count"]
+SQL_TREE_ROWS = """
+	SELECT n.uuid, n.parent_uuid, n.type, n.name, n.cached_path,
+		(SELECT COUNT(*) FROM node_files nf WHERE nf.node_uuid = n.uuid)
+	FROM nodes n
+	ORDER BY n.cached_path
+"""
+
+# Tags, files, relationships and children are aggregated into JSON arrays
+# by SQLite, so the whole node comes back in one statement.
+SQL_GET_NODE = """
+	SELECT n.uuid, n.type, n.name, n.cached_path, n.metadata, n.parent_uuid, n.created_at, n.last_modified,
+		(SELECT json_group_array(t.tag) FROM tags t WHERE t.node_uuid = n.uuid),
+		(SELECT json_group_array(json_object(
+				'name', f.original_name, 'hash', f.file_hash, 'size', f.size_bytes,
+				'ext', f.ext, 'order', f.display_order))
+			FROM (
+				SELECT nf.original_name, nf.file_hash, b.size_bytes, b.ext, nf.display_order
+				FROM node_files nf
+				JOIN blobs b ON nf.file_hash = b.hash
+				WHERE nf.node_uuid = n.uuid
+				ORDER BY nf.display_order
+			) f),
+		(SELECT json_group_array(json_object(
+				'relation', r.relation, 'target_uuid', r.target_uuid,
+				'target_path', r.cached_path, 'target_name', r.name))
+			FROM (
+				SELECT e.relation, e.target_uuid, tn.cached_path, tn.name
+				FROM edges e
+				JOIN nodes tn ON e.target_uuid = tn.uuid
+				WHERE e.source_uuid = n.uuid
+				ORDER BY e.target_uuid, e.relation
+			) r),
+		(SELECT json_group_array(json_object(
+				'uuid', c.uuid, 'type', c.type, 'name', c.name, 'path', c.cached_path))
+			FROM (
+				SELECT uuid, type, name, cached_path
+				FROM nodes WHERE parent_uuid = n.uuid
+				ORDER BY type DESC, name
+			) c)
+	FROM nodes n WHERE n.uuid = ?
+"""
+
+
+@api_bp.before_request
+def limit_json_body():
+	"""
+	Hold JSON bodies to a far smaller cap than file uploads, rejecting
+	oversized ones before any of the body is read.
+	"""
+	if request.mimetype != "application/json":
+		return None
+	max_size = current_app.config["DLFI_CONFIG"].max_json_size
+	if request.content_length is not None and request.content_length > max_size:
+		return jsonify({"error": "Request body too large"}), 413
+	# Also bounds bodies sent without a Content-Length
+	request.max_content_length = max_size
+	return None
+
+
+@api_bp.errorhandler(RequestEntityTooLarge)
+def body_too_large(e):
+	"""Report oversized bodies as JSON like other API errors."""
+	return jsonify({"error": "Request body too large"}), 413
+
+
+@api_bp.errorhandler(Exception)
+def unexpected_error(e):
+	"""
+	Report any failure a route doesn't handle itself as a JSON 500, so
+	routes only catch the errors they turn into a different status.
+	"""
+	if isinstance(e, HTTPException):
+		return e
+	logger.exception(f"Unhandled error in {request.endpoint}")
+	return jsonify({"error": str(e)}), 500
+
+
 def get_dlfi():
 	"""Get the current DLFI instance."""
 	return current_app.config.get("DLFI_INSTANCE")
@@ -29,6 +177,86 @@ def require_vault(f):
 	return decorated
 
 
+def data_etag(dlfi) -> str:
+	"""
+	Version tag for everything stored in the vault database.
+	commit_count moves after each of this handle's transactions commits and
+	data_version when another process commits, so the tag only changes once
+	the read connections can see the new data. Take it before reading: a
+	commit in between then tags newer data with the older version, which
+	the next request replaces, never older data with the newer one.
+	"""
+	data_version = dlfi.conn.execute("PRAGMA data_version").fetchone()[0]
+	return f"{dlfi.instance_id}-{dlfi.commit_count}-{data_version}"
+
+
+def has_running_jobs(dlfi) -> bool:
+	"""Whether an extractor job started on this vault is still writing to it."""
+	return any(
+		instance_id == dlfi.instance_id and not future.done()
+		for instance_id, future in list(current_app.config["EXTRACTOR_JOBS"].values())
+	)
+
+
+def not_modified(etag: str) -> Optional[Response]:
+	"""Return a 304 response if the client already holds this version."""
+	if request.if_none_match.contains_weak(etag):
+		response = Response(status=304)
+		response.set_etag(etag)
+		response.headers["Cache-Control"] = "no-cache"
+		return response
+	return None
+
+
+def with_etag(response: Response, etag: str) -> Response:
+	"""Tag a response so the client revalidates it instead of refetching."""
+	response.set_etag(etag)
+	response.headers["Cache-Control"] = "no-cache"
+	return response
+
+
+RANGE_NOT_SATISFIABLE = (-1, -1)
+
+
+def requested_range(etag: str, size: int) -> Optional[Tuple[int, int]]:
+	"""
+	The single byte range the request asks for, as (start, stop), or None
+	to send the whole body. Multi-range requests and an If-Range that no
+	longer matches get the whole body too; ranges outside the body give
+	RANGE_NOT_SATISFIABLE.
+	"""
+	byte_range = request.range
+	if byte_range is None or byte_range.units != "bytes" or len(byte_range.ranges) != 1:
+		return None
+	if_range = request.if_range
+	if if_range.date is not None or (if_range.etag is not None and if_range.etag != etag):
+		return None
+	return byte_range.range_for_length(size) or RANGE_NOT_SATISFIABLE
+
+
+def blob_cache(response: Response, dlfi) -> Response:
+	"""
+	Let the browser keep blob-derived responses indefinitely; their URLs
+	are content hashes. Decrypted content is kept out of shared caches.
+	"""
+	scope = "private" if dlfi.crypto.enabled else "public"
+	response.headers["Cache-Control"] = f"{scope}, max-age={BLOB_MAX_AGE}, immutable"
+	return response
+
+
+def get_autocomplete_provider(dlfi) -> AutocompleteProvider:
+	"""
+	One provider per open vault, so the tags, paths and parsed metadata it
+	looks up are reused across keystrokes until the data changes.
+	"""
+	provider = current_app.config.get("AUTOCOMPLETE_PROVIDER")
+	if provider is None or provider.dlfi is not dlfi:
+		provider = AutocompleteProvider(dlfi)
+		current_app.config["AUTOCOMPLETE_PROVIDER"] = provider
+	provider.refresh(data_etag(dlfi))
+	return provider
+
+
 # ============ Vault Management ============
 
 def verify_vault_password(dlfi) -> bool:
@@ -129,6 +357,8 @@ def open_vault():
 	# Close existing vault if open
 	existing = current_app.config.get("DLFI_INSTANCE")
 	if existing:
+		if has_running_jobs(existing):
+			return jsonify({"error": "An extractor is still running in the open vault"}), 409
 		try:
 			existing.close()
 		except:
@@ -209,6 +439,8 @@ def create_vault():
 	# Close existing vault if open
 	existing = current_app.config.get("DLFI_INSTANCE")
 	if existing:
+		if has_running_jobs(existing):
+			return jsonify({"error": "An extractor is still running in the open vault"}), 409
 		try:
 			existing.close()
 		except:
@@ -245,13 +477,12 @@ def vault_info():
 	"""Get current vault information."""
 	dlfi = get_dlfi()
 	
-	# Count nodes
-	cursor = dlfi.conn.execute("SELECT type, COUNT(*) FROM nodes GROUP BY type")
-	counts = dict(cursor.fetchall())
-	
-	# Count blobs
-	cursor = dlfi.conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM blobs")
-	row = cursor.fetchone()
+	with dlfi.read_conn() as conn:
+		# Count nodes
+		counts = dict(conn.execute("SELECT type, COUNT(*) FROM nodes GROUP BY type").fetchall())
+		
+		# Count blobs
+		row = conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM blobs").fetchone()
 	blob_count = row[0] or 0
 	total_size = row[1] or 0
 	
@@ -342,40 +573,66 @@ def browse_path():
 @api_bp.route("/nodes", methods=["GET"])
 @require_vault
 def list_nodes():
-	"""List all nodes in the vault."""
+	"""
+	List all nodes in the vault.
+	With ?format=columns, returns {"columns": [...], "rows": [[...], ...]}
+	holding just the tree fields, serialized straight from the cursor rows.
+	"""
 	dlfi = get_dlfi()
 	
-	cursor = dlfi.conn.execute("""
-		SELECT uuid, type, name, cached_path, metadata, parent_uuid, created_at
-		FROM nodes
-		ORDER BY cached_path
-	""")
-	
-	nodes = []
-	for row in cursor:
-		uuid, node_type, name, path, metadata, parent, created = row
-		
-		# Get tags
-		tags_cursor = dlfi.conn.execute("SELECT tag FROM tags WHERE node_uuid = ?", (uuid,))
-		tags = [t[0] for t in tags_cursor]
+	# The UI reloads the tree after every change; skip the query and
+	# serialization entirely when nothing was written since its last copy.
+	etag = data_etag(dlfi)
+	cached = not_modified(etag)
+	if cached:
+		return cached
+	
+	if request.args.get("format") == "columns":
+		# The encoded tree is kept for the current data version, so other
+		# tabs and clients without a copy don't rebuild it either. Compressed
+		# forms are kept alongside, keyed by content encoding.
+		tree_cache = current_app.config.get("TREE_CACHE")
+		if tree_cache and tree_cache[0] == etag:
+			bodies = tree_cache[1]
+		else:
+			with dlfi.read_conn() as conn:
+				rows = conn.execute(SQL_TREE_ROWS).fetchall()
+			bodies = {None: dumps_bytes({"columns": TREE_COLUMNS, "rows": rows})}
+			current_app.config["TREE_CACHE"] = (etag, bodies)
 		
-		# Get file count
-		files_cursor = dlfi.conn.execute("SELECT COUNT(*) FROM node_files WHERE node_uuid = ?", (uuid,))
-		file_count = files_cursor.fetchone()[0]
+		encoding = negotiate_encoding() if len(bodies[None]) >= MIN_COMPRESS_SIZE else None
+		if encoding not in bodies:
+			bodies[encoding] = compress_bytes(bodies[None], encoding)
 		
-		nodes.append({
-			"uuid": uuid,
-			"type": node_type,
-			"name": name,
-			"path": path,
-			"parent": parent,
-			"metadata": json.loads(metadata) if metadata else {},
-			"tags": tags,
-			"file_count": file_count,
-			"created_at": created
-		})
+		response = with_etag(Response(bodies[encoding], mimetype="application/json"), etag)
+		response.vary.add("Accept-Encoding")
+		if encoding:
+			# Matches what compress_response does for other JSON bodies
+			response.headers["Content-Encoding"] = encoding
+			response.set_etag(etag, weak=True)
+		return response
+	
+	with dlfi.read_conn() as conn:
+		rows = conn.execute(SQL_LIST_NODES).fetchall()
+	
+	def nodes():
+		for uuid, node_type, name, path, metadata, parent, created, tags, file_count in rows:
+			yield {
+				"uuid": uuid,
+				"type": node_type,
+				"name": name,
+				"path": path,
+				"parent": parent,
+				"metadata": json_loads(metadata) if metadata else {},
+				"tags": raw_json(tags),
+				"file_count": file_count,
+				"created_at": created
+			}
 	
-	return jsonify({"nodes": nodes})
+	# Each node is parsed and encoded as its chunk is sent rather than
+	# building the whole list and document up front
+	response = Response(stream_object({}, "nodes", nodes()), mimetype="application/json")
+	return with_etag(response, etag)
 
 
 @api_bp.route("/nodes/<uuid>", methods=["GET"])
@@ -384,87 +641,32 @@ def get_node(uuid: str):
 	"""Get detailed node information."""
 	dlfi = get_dlfi()
 	
-	cursor = dlfi.conn.execute("""
-		SELECT uuid, type, name, cached_path, metadata, parent_uuid, created_at, last_modified
-		FROM nodes WHERE uuid = ?
-	""", (uuid,))
+	etag = data_etag(dlfi)
+	cached = not_modified(etag)
+	if cached:
+		return cached
 	
-	row = cursor.fetchone()
+	with dlfi.read_conn() as conn:
+		row = conn.execute(SQL_GET_NODE, (uuid,)).fetchone()
 	if not row:
 		return jsonify({"error": "Node not found"}), 404
 	
-	node_uuid, node_type, name, path, metadata, parent, created, modified = row
-	
-	# Get tags
-	tags_cursor = dlfi.conn.execute("SELECT tag FROM tags WHERE node_uuid = ?", (uuid,))
-	tags = [t[0] for t in tags_cursor]
-	
-	# Get files
-	files_cursor = dlfi.conn.execute("""
-		SELECT nf.original_name, nf.file_hash, b.size_bytes, b.ext, nf.display_order
-		FROM node_files nf
-		JOIN blobs b ON nf.file_hash = b.hash
-		WHERE nf.node_uuid = ?
-		ORDER BY nf.display_order
-	""", (uuid,))
-	
-	files = []
-	for fname, fhash, fsize, fext, forder in files_cursor:
-		files.append({
-			"name": fname,
-			"hash": fhash,
-			"size": fsize,
-			"ext": fext,
-			"order": forder
-		})
+	node_uuid, node_type, name, path, metadata, parent, created, modified, tags, files, relationships, children = row
 	
-	# Get relationships
-	rels_cursor = dlfi.conn.execute("""
-		SELECT e.relation, e.target_uuid, n.cached_path, n.name
-		FROM edges e
-		JOIN nodes n ON e.target_uuid = n.uuid
-		WHERE e.source_uuid = ?
-	""", (uuid,))
-	
-	relationships = []
-	for rel, target_uuid, target_path, target_name in rels_cursor:
-		relationships.append({
-			"relation": rel,
-			"target_uuid": target_uuid,
-			"target_path": target_path,
-			"target_name": target_name
-		})
-	
-	# Get children
-	children_cursor = dlfi.conn.execute("""
-		SELECT uuid, type, name, cached_path
-		FROM nodes WHERE parent_uuid = ?
-		ORDER BY type DESC, name
-	""", (uuid,))
-	
-	children = []
-	for c_uuid, c_type, c_name, c_path in children_cursor:
-		children.append({
-			"uuid": c_uuid,
-			"type": c_type,
-			"name": c_name,
-			"path": c_path
-		})
-	
-	return jsonify({
+	return with_etag(jsonify({
 		"uuid": node_uuid,
 		"type": node_type,
 		"name": name,
 		"path": path,
 		"parent": parent,
-		"metadata": json.loads(metadata) if metadata else {},
-		"tags": tags,
-		"files": files,
-		"relationships": relationships,
-		"children": children,
+		"metadata": json_loads(metadata) if metadata else {},
+		"tags": json_loads(tags),
+		"files": json_loads(files),
+		"relationships": json_loads(relationships),
+		"children": json_loads(children),
 		"created_at": created,
 		"last_modified": modified
-	})
+	}), etag)
 
 
 @api_bp.route("/nodes", methods=["POST"])
@@ -485,18 +687,19 @@ def create_node():
 	if node_type not in ("VAULT", "RECORD"):
 		return jsonify({"error": "Type must be VAULT or RECORD"}), 400
 	
-	try:
+	# The node and all its tags land in one commit
+	with dlfi.transaction():
 		if node_type == "VAULT":
 			uuid = dlfi.create_vault(path, metadata=metadata)
 		else:
 			uuid = dlfi.create_record(path, metadata=metadata)
 		
-		for tag in tags:
-			dlfi.add_tag(path, tag)
-		
-		return jsonify({"success": True, "uuid": uuid, "path": path})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+		dlfi.conn.executemany(
+			"INSERT OR IGNORE INTO tags (node_uuid, tag) VALUES (?, ?)",
+			[(uuid, tag.lower()) for tag in tags]
+		)
+	
+	return jsonify({"success": True, "uuid": uuid, "path": path})
 
 
 @api_bp.route("/nodes/<uuid>", methods=["PUT"])
@@ -506,32 +709,28 @@ def update_node(uuid: str):
 	dlfi = get_dlfi()
 	data = request.get_json() or {}
 	
-	cursor = dlfi.conn.execute("SELECT cached_path FROM nodes WHERE uuid = ?", (uuid,))
+	cursor = dlfi.conn.execute(SQL_NODE_PATH, (uuid,))
 	row = cursor.fetchone()
 	if not row:
 		return jsonify({"error": "Node not found"}), 404
 	
-	try:
-		with dlfi.conn:
-			# Update metadata
-			if "metadata" in data:
-				dlfi.conn.execute(
-					"UPDATE nodes SET metadata = ?, last_modified = ? WHERE uuid = ?",
-					(json.dumps(data["metadata"]), time.time(), uuid)
-				)
-			
-			# Update tags
-			if "tags" in data:
-				dlfi.conn.execute("DELETE FROM tags WHERE node_uuid = ?", (uuid,))
-				for tag in data["tags"]:
-					dlfi.conn.execute(
-						"INSERT OR IGNORE INTO tags (node_uuid, tag) VALUES (?, ?)",
-						(uuid, tag.lower())
-					)
+	with dlfi.transaction():
+		# Update metadata
+		if "metadata" in data:
+			dlfi.conn.execute(
+				"UPDATE nodes SET metadata = ?, last_modified = ? WHERE uuid = ?",
+				(json_dumps(data["metadata"]), time.time(), uuid)
+			)
 		
-		return jsonify({"success": True})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+		# Update tags
+		if "tags" in data:
+			dlfi.conn.execute("DELETE FROM tags WHERE node_uuid = ?", (uuid,))
+			dlfi.conn.executemany(
+				"INSERT OR IGNORE INTO tags (node_uuid, tag) VALUES (?, ?)",
+				[(uuid, tag.lower()) for tag in data["tags"]]
+			)
+	
+	return jsonify({"success": True})
 
 
 @api_bp.route("/nodes/<uuid>", methods=["DELETE"])
@@ -540,19 +739,14 @@ def delete_node(uuid: str):
 	"""Delete a node and its children."""
 	dlfi = get_dlfi()
 	
-	cursor = dlfi.conn.execute("SELECT cached_path FROM nodes WHERE uuid = ?", (uuid,))
-	row = cursor.fetchone()
-	if not row:
-		return jsonify({"error": "Node not found"}), 404
+	with dlfi.transaction():
+		# CASCADE will handle children, node_files, tags, edges
+		deleted = dlfi.conn.execute("DELETE FROM nodes WHERE uuid = ?", (uuid,)).rowcount
 	
-	try:
-		with dlfi.conn:
-			# CASCADE will handle children, node_files, tags, edges
-			dlfi.conn.execute("DELETE FROM nodes WHERE uuid = ?", (uuid,))
-		
-		return jsonify({"success": True})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+	# No separate lookup first: an unknown uuid simply deletes nothing
+	if not deleted:
+		return jsonify({"error": "Node not found"}), 404
+	return jsonify({"success": True})
 
 
 # ============ File Operations ============
@@ -560,10 +754,10 @@ def delete_node(uuid: str):
 @api_bp.route("/nodes/<uuid>/files", methods=["POST"])
 @require_vault
 def upload_file(uuid: str):
-	"""Upload a file to a record."""
+	"""Upload one or more files to a record."""
 	dlfi = get_dlfi()
 	
-	cursor = dlfi.conn.execute("SELECT cached_path, type FROM nodes WHERE uuid = ?", (uuid,))
+	cursor = dlfi.conn.execute(SQL_NODE_PATH_TYPE, (uuid,))
 	row = cursor.fetchone()
 	if not row:
 		return jsonify({"error": "Node not found"}), 404
@@ -572,18 +766,24 @@ def upload_file(uuid: str):
 	if node_type != "RECORD":
 		return jsonify({"error": "Can only add files to records"}), 400
 	
-	if "file" not in request.files:
+	files = request.files.getlist("file")
+	if not files:
 		return jsonify({"error": "No file provided"}), 400
 	
-	file = request.files["file"]
-	if not file.filename:
+	if not all(file.filename for file in files):
 		return jsonify({"error": "No filename"}), 400
 	
-	try:
-		dlfi.append_stream(path, file.stream, file.filename)
-		return jsonify({"success": True})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+	# Files are read and hashed in parallel, then committed a batch at a time
+	results = dlfi.append_streams(path, [(file.stream, file.filename) for file in files])
+	
+	errors = [
+		{"file": file.filename, "error": str(err)}
+		for file, err in zip(files, results) if err is not None
+	]
+	if len(errors) == len(files):
+		return jsonify({"error": errors[0]["error"], "errors": errors}), 500
+	
+	return jsonify({"success": True, "count": len(files) - len(errors), "errors": errors})
 
 
 @api_bp.route("/blobs/<file_hash>", methods=["GET"])
@@ -593,46 +793,57 @@ def get_blob(file_hash: str):
 	dlfi = get_dlfi()
 	
 	# Get blob info
-	cursor = dlfi.conn.execute(
-		"SELECT ext FROM blobs WHERE hash = ?", (file_hash,)
-	)
-	row = cursor.fetchone()
-	if not row:
+	info = dlfi.blob_info(file_hash)
+	if not info:
 		return jsonify({"error": "Blob not found"}), 404
 	
-	ext = row[0]
-	
-	try:
-		data = dlfi.read_blob(file_hash)
-		if data is None:
-			return jsonify({"error": "Blob data not found"}), 404
-		
-		# Determine MIME type
-		mime_types = {
-			"jpg": "image/jpeg",
-			"jpeg": "image/jpeg",
-			"png": "image/png",
-			"gif": "image/gif",
-			"webp": "image/webp",
-			"mp4": "video/mp4",
-			"webm": "video/webm",
-			"mov": "video/quicktime",
-			"pdf": "application/pdf",
-			"txt": "text/plain",
-		}
-		mime = mime_types.get(ext, "application/octet-stream")
+	ext, size = info
+	mime = BLOB_MIME_TYPES.get(ext, "application/octet-stream")
+	filename = f"{file_hash}.{ext}" if ext else file_hash
+	
+	byte_range = requested_range(file_hash, size)
+	if byte_range == RANGE_NOT_SATISFIABLE:
+		response = Response(status=416)
+		response.headers["Content-Range"] = f"bytes */{size}"
+		return response
+	
+	# Plain single-file blobs go out via send_file, which uses the WSGI
+	# server's file wrapper (sendfile where supported) and handles
+	# conditional and range requests
+	path = dlfi.blob_file_path(file_hash)
+	if path is not None:
+		return blob_cache(send_file(
+			path,
+			mimetype=mime,
+			download_name=filename,
+			conditional=True,
+			etag=file_hash
+		), dlfi)
+	
+	response = not_modified(file_hash)
+	if response is None:
+		# Partitioned and encrypted blobs honour Range here, so media can
+		# seek without fetching everything before the offset
+		start, stop = byte_range or (0, size)
 		
-		return Response(
-			data,
+		# Stream in chunks rather than loading the whole blob into memory
+		chunks = dlfi.iter_blob(file_hash, start=start, stop=stop)
+		if chunks is None:
+			return jsonify({"error": "Blob data not found"}), 404
+		response = Response(
+			chunks,
+			status=206 if byte_range else 200,
 			mimetype=mime,
 			headers={
-				"Content-Disposition": f"inline; filename={file_hash}.{ext}" if ext else f"inline; filename={file_hash}",
-				"Cache-Control": "max-age=31536000"
+				"Content-Disposition": f"inline; filename={filename}",
+				"Content-Length": str(stop - start),
+				"Accept-Ranges": "bytes"
 			}
 		)
-	except Exception as e:
-		logger.exception("Failed to read blob")
-		return jsonify({"error": str(e)}), 500
+		if byte_range:
+			response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+		response.set_etag(file_hash)
+	return blob_cache(response, dlfi)
 
 
 @api_bp.route("/blobs/<file_hash>/thumbnail", methods=["GET"])
@@ -641,37 +852,39 @@ def get_blob_thumbnail(file_hash: str):
 	"""Get a thumbnail for an image blob."""
 	dlfi = get_dlfi()
 	
-	cursor = dlfi.conn.execute(
-		"SELECT ext FROM blobs WHERE hash = ?", (file_hash,)
-	)
-	row = cursor.fetchone()
-	if not row:
+	info = dlfi.blob_info(file_hash)
+	if not info:
 		return jsonify({"error": "Blob not found"}), 404
 	
-	ext = row[0]
+	ext = info[0]
 	if ext not in ("jpg", "jpeg", "png", "gif", "webp"):
 		return jsonify({"error": "Not an image"}), 400
 	
+	# Thumbnails are derived from immutable blobs; skip decoding on revalidation
+	etag = f"{file_hash}-thumb"
+	cached = not_modified(etag)
+	if cached:
+		return blob_cache(cached, dlfi)
+	
+	data = dlfi.read_blob(file_hash)
+	if data is None:
+		return jsonify({"error": "Blob data not found"}), 404
+	
+	# Try to create thumbnail with PIL if available
 	try:
-		data = dlfi.read_blob(file_hash)
-		if data is None:
-			return jsonify({"error": "Blob data not found"}), 404
-		
-		# Try to create thumbnail with PIL if available
-		try:
-			from PIL import Image
-			img = Image.open(BytesIO(data))
-			img.thumbnail((200, 200))
-			output = BytesIO()
-			img.save(output, format="JPEG", quality=80)
-			output.seek(0)
-			return Response(output, mimetype="image/jpeg")
-		except ImportError:
-			# PIL not available, return original
-			mime = "image/jpeg" if ext in ("jpg", "jpeg") else f"image/{ext}"
-			return Response(data, mimetype=mime)
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+		from PIL import Image
+		img = Image.open(BytesIO(data))
+		img.thumbnail((200, 200))
+		output = BytesIO()
+		img.save(output, format="JPEG", quality=80)
+		output.seek(0)
+		response = Response(output, mimetype="image/jpeg")
+	except ImportError:
+		# PIL not available, return original
+		mime = BLOB_MIME_TYPES[ext]
+		response = Response(data, mimetype=mime)
+	response.set_etag(etag)
+	return blob_cache(response, dlfi)
 
 
 # ============ Relationships ============
@@ -689,7 +902,7 @@ def add_relationship(uuid: str):
 	if not target_path or not relation:
 		return jsonify({"error": "target_path and relation required"}), 400
 	
-	cursor = dlfi.conn.execute("SELECT cached_path FROM nodes WHERE uuid = ?", (uuid,))
+	cursor = dlfi.conn.execute(SQL_NODE_PATH, (uuid,))
 	row = cursor.fetchone()
 	if not row:
 		return jsonify({"error": "Source node not found"}), 404
@@ -710,8 +923,8 @@ def list_relationship_types():
 	"""List all unique relationship types used in the vault."""
 	dlfi = get_dlfi()
 	
-	cursor = dlfi.conn.execute("SELECT DISTINCT relation FROM edges ORDER BY relation")
-	types = [row[0] for row in cursor]
+	with dlfi.read_conn() as conn:
+		types = [row[0] for row in conn.execute("SELECT DISTINCT relation FROM edges ORDER BY relation")]
 	
 	# Add common suggested types if not present
 	common_types = ['AUTHORED_BY', 'CREATED_BY', 'PART_OF', 'RELATED_TO', 'REFERENCES', 'PARENT_OF', 'CHILD_OF']
@@ -729,16 +942,17 @@ def get_node_relationships(uuid: str):
 	"""Get all relationships for a node (both incoming and outgoing)."""
 	dlfi = get_dlfi()
 	
-	# Outgoing relationships
-	outgoing_cursor = dlfi.conn.execute("""
-		SELECT e.relation, e.target_uuid, n.cached_path, n.name, n.type
-		FROM edges e
-		JOIN nodes n ON e.target_uuid = n.uuid
-		WHERE e.source_uuid = ?
-	""", (uuid,))
+	etag = data_etag(dlfi)
+	cached = not_modified(etag)
+	if cached:
+		return cached
+	
+	with dlfi.read_conn() as conn:
+		outgoing_rows = conn.execute(SQL_OUTGOING_EDGES, (uuid,)).fetchall()
+		incoming_rows = conn.execute(SQL_INCOMING_EDGES, (uuid,)).fetchall()
 	
 	outgoing = []
-	for rel, target_uuid, target_path, target_name, target_type in outgoing_cursor:
+	for rel, target_uuid, target_path, target_name, target_type in outgoing_rows:
 		outgoing.append({
 			"relation": rel,
 			"target_uuid": target_uuid,
@@ -747,16 +961,8 @@ def get_node_relationships(uuid: str):
 			"target_type": target_type
 		})
 	
-	# Incoming relationships
-	incoming_cursor = dlfi.conn.execute("""
-		SELECT e.relation, e.source_uuid, n.cached_path, n.name, n.type
-		FROM edges e
-		JOIN nodes n ON e.source_uuid = n.uuid
-		WHERE e.target_uuid = ?
-	""", (uuid,))
-	
 	incoming = []
-	for rel, source_uuid, source_path, source_name, source_type in incoming_cursor:
+	for rel, source_uuid, source_path, source_name, source_type in incoming_rows:
 		incoming.append({
 			"relation": rel,
 			"source_uuid": source_uuid,
@@ -765,7 +971,7 @@ def get_node_relationships(uuid: str):
 			"source_type": source_type
 		})
 	
-	return jsonify({"outgoing": outgoing, "incoming": incoming})
+	return with_etag(jsonify({"outgoing": outgoing, "incoming": incoming}), etag)
 
 
 @api_bp.route("/nodes/<uuid>/relationships", methods=["DELETE"])
@@ -782,21 +988,18 @@ def delete_relationship(uuid: str):
 	if not target_uuid or not relation:
 		return jsonify({"error": "target_uuid and relation required"}), 400
 	
-	try:
-		with dlfi.conn:
-			if direction == "outgoing":
-				dlfi.conn.execute(
-					"DELETE FROM edges WHERE source_uuid = ? AND target_uuid = ? AND relation = ?",
-					(uuid, target_uuid, relation)
-				)
-			else:
-				dlfi.conn.execute(
-					"DELETE FROM edges WHERE source_uuid = ? AND target_uuid = ? AND relation = ?",
-					(target_uuid, uuid, relation)
-				)
-		return jsonify({"success": True})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+	with dlfi.transaction():
+		if direction == "outgoing":
+			dlfi.conn.execute(
+				"DELETE FROM edges WHERE source_uuid = ? AND target_uuid = ? AND relation = ?",
+				(uuid, target_uuid, relation)
+			)
+		else:
+			dlfi.conn.execute(
+				"DELETE FROM edges WHERE source_uuid = ? AND target_uuid = ? AND relation = ?",
+				(target_uuid, uuid, relation)
+			)
+	return jsonify({"success": True})
 
 
 # ============ Bulk Operations ============
@@ -814,17 +1017,13 @@ def bulk_add_tags():
 	if not uuids or not tags:
 		return jsonify({"error": "uuids and tags required"}), 400
 	
-	try:
-		with dlfi.conn:
-			for uuid in uuids:
-				for tag in tags:
-					dlfi.conn.execute(
-						"INSERT OR IGNORE INTO tags (node_uuid, tag) VALUES (?, ?)",
-						(uuid, tag.lower().strip())
-					)
-		return jsonify({"success": True, "count": len(uuids)})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+	tags = [tag.lower().strip() for tag in tags]
+	with dlfi.transaction():
+		dlfi.conn.executemany(
+			"INSERT OR IGNORE INTO tags (node_uuid, tag) VALUES (?, ?)",
+			[(uuid, tag) for uuid in uuids for tag in tags]
+		)
+	return jsonify({"success": True, "count": len(uuids)})
 
 
 @api_bp.route("/bulk/tags", methods=["DELETE"])
@@ -840,17 +1039,13 @@ def bulk_remove_tags():
 	if not uuids or not tags:
 		return jsonify({"error": "uuids and tags required"}), 400
 	
-	try:
-		with dlfi.conn:
-			for uuid in uuids:
-				for tag in tags:
-					dlfi.conn.execute(
-						"DELETE FROM tags WHERE node_uuid = ? AND tag = ?",
-						(uuid, tag.lower().strip())
-					)
-		return jsonify({"success": True, "count": len(uuids)})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+	tags = [tag.lower().strip() for tag in tags]
+	with dlfi.transaction():
+		dlfi.conn.executemany(
+			"DELETE FROM tags WHERE node_uuid = ? AND tag = ?",
+			[(uuid, tag) for uuid in uuids for tag in tags]
+		)
+	return jsonify({"success": True, "count": len(uuids)})
 
 
 @api_bp.route("/bulk/relationships", methods=["POST"])
@@ -868,23 +1063,21 @@ def bulk_add_relationships():
 		return jsonify({"error": "source_uuids, target_path, and relation required"}), 400
 	
 	# Get target UUID
-	cursor = dlfi.conn.execute("SELECT uuid FROM nodes WHERE cached_path = ?", (target_path,))
+	cursor = dlfi.conn.execute(SQL_NODE_UUID_BY_PATH, (target_path,))
 	row = cursor.fetchone()
 	if not row:
 		return jsonify({"error": f"Target not found: {target_path}"}), 404
 	
 	target_uuid = row[0]
 	
-	try:
-		with dlfi.conn:
-			for source_uuid in source_uuids:
-				dlfi.conn.execute("""
-					INSERT OR REPLACE INTO edges (source_uuid, target_uuid, relation, created_at)
-					VALUES (?, ?, ?, ?)
-				""", (source_uuid, target_uuid, relation.upper(), time.time()))
-		return jsonify({"success": True, "count": len(source_uuids)})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+	relation = relation.upper()
+	now = time.time()
+	with dlfi.transaction():
+		dlfi.conn.executemany("""
+			INSERT OR REPLACE INTO edges (source_uuid, target_uuid, relation, created_at)
+			VALUES (?, ?, ?, ?)
+		""", [(source_uuid, target_uuid, relation, now) for source_uuid in source_uuids])
+	return jsonify({"success": True, "count": len(source_uuids)})
 
 
 @api_bp.route("/bulk/delete", methods=["POST"])
@@ -899,13 +1092,9 @@ def bulk_delete():
 	if not uuids:
 		return jsonify({"error": "uuids required"}), 400
 	
-	try:
-		with dlfi.conn:
-			for uuid in uuids:
-				dlfi.conn.execute("DELETE FROM nodes WHERE uuid = ?", (uuid,))
-		return jsonify({"success": True, "count": len(uuids)})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+	with dlfi.transaction():
+		dlfi.conn.executemany("DELETE FROM nodes WHERE uuid = ?", [(uuid,) for uuid in uuids])
+	return jsonify({"success": True, "count": len(uuids)})
 
 
 @api_bp.route("/bulk/metadata", methods=["POST"])
@@ -921,23 +1110,20 @@ def bulk_update_metadata():
 	if not uuids or not metadata:
 		return jsonify({"error": "uuids and metadata required"}), 400
 	
-	try:
-		with dlfi.conn:
-			for uuid in uuids:
-				# Get existing metadata
-				cursor = dlfi.conn.execute("SELECT metadata FROM nodes WHERE uuid = ?", (uuid,))
-				row = cursor.fetchone()
-				if row:
-					existing = json.loads(row[0]) if row[0] else {}
-					# Merge new metadata
-					existing.update(metadata)
-					dlfi.conn.execute(
-						"UPDATE nodes SET metadata = ?, last_modified = ? WHERE uuid = ?",
-						(json.dumps(existing), time.time(), uuid)
-					)
-		return jsonify({"success": True, "count": len(uuids)})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+	with dlfi.transaction():
+		for uuid in uuids:
+			# Get existing metadata
+			cursor = dlfi.conn.execute("SELECT metadata FROM nodes WHERE uuid = ?", (uuid,))
+			row = cursor.fetchone()
+			if row:
+				existing = json_loads(row[0]) if row[0] else {}
+				# Merge new metadata
+				existing.update(metadata)
+				dlfi.conn.execute(
+					"UPDATE nodes SET metadata = ?, last_modified = ? WHERE uuid = ?",
+					(json_dumps(existing), time.time(), uuid)
+				)
+	return jsonify({"success": True, "count": len(uuids)})
 
 # ============ Tags ============
 
@@ -947,8 +1133,8 @@ def list_all_tags():
 	"""List all unique tags in the vault."""
 	dlfi = get_dlfi()
 	
-	cursor = dlfi.conn.execute("SELECT DISTINCT tag FROM tags ORDER BY tag")
-	tags = [row[0] for row in cursor]
+	with dlfi.read_conn() as conn:
+		tags = [row[0] for row in conn.execute("SELECT DISTINCT tag FROM tags ORDER BY tag")]
 	
 	return jsonify({"tags": tags})
 
@@ -986,11 +1172,8 @@ def export_static():
 	"""Generate static site export."""
 	dlfi = get_dlfi()
 	
-	try:
-		dlfi.generate_static_site()
-		return jsonify({"success": True, "message": "Static site generated in vault root"})
-	except Exception as e:
-		return jsonify({"error": str(e)}), 500
+	dlfi.generate_static_site()
+	return jsonify({"success": True, "message": "Static site generated in vault root"})
 
 # ============ Query System ============
 
@@ -1003,34 +1186,59 @@ def execute_query():
     
     query_str = data.get("query", "")
     offset = int(data.get("offset", 0))
+    fields = data.get("fields")
+    
+    if fields is not None and (
+        not isinstance(fields, list) or not all(isinstance(f, str) and f for f in fields)
+    ):
+        return jsonify({"error": "fields must be a list of metadata keys"}), 400
     
     if not query_str.strip():
         # Empty query - return all nodes
         query_str = "type:VAULT | type:RECORD"
     
+    # Results are kept for the current data version, so repeating a query
+    # (paging back, re-running after a tab switch) skips parsing and SQL
+    etag = data_etag(dlfi)
+    query_cache = current_app.config.get("QUERY_CACHE")
+    if not query_cache or query_cache[0] != etag:
+        query_cache = current_app.config["QUERY_CACHE"] = (etag, {})
+    results = query_cache[1]
+    key = (query_str, offset, tuple(fields) if fields is not None else None)
+    
     try:
-        parser = QueryParser(query_str)
-        ast = parser.parse()
-        
-        executor = QueryExecutor(dlfi)
-        result = executor.execute(ast, offset=offset)
+        start = time.perf_counter()
+        cached = results.get(key)
+        if cached is None:
+            parser = QueryParser(query_str)
+            ast = parser.parse()
+            
+            executor = QueryExecutor(dlfi)
+            result = executor.execute(ast, offset=offset, fields=fields)
+            
+            # Timing is per response, so it isn't part of the cached entry
+            head = {
+                "success": True,
+                "total": result.total_count,
+                "limit": result.limit,
+                "offset": result.offset
+            }
+            if len(results) >= QUERY_CACHE_SIZE:
+                results.clear()
+            results[key] = (head, result.nodes)
+            head = dict(head, query_time_ms=result.query_time_ms, cached=False)
+            nodes = result.nodes
+        else:
+            head, nodes = cached
+            lookup_ms = round((time.perf_counter() - start) * 1000, 2)
+            head = dict(head, query_time_ms=lookup_ms, cached=True)
         
-        return jsonify({
-            "success": True,
-            "nodes": result.nodes,
-            "total": result.total_count,
-            "limit": result.limit,
-            "offset": result.offset,
-            "query_time_ms": result.query_time_ms
-        })
+        return Response(stream_object(head, "nodes", nodes), mimetype="application/json")
     except ParseError as e:
         return jsonify({
             "error": f"Query parse error: {e.message}",
             "position": e.position
         }), 400
-    except Exception as e:
-        logger.exception("Query execution failed")
-        return jsonify({"error": str(e)}), 500
 
 
 @api_bp.route("/autocomplete", methods=["GET"])
@@ -1045,7 +1253,7 @@ def get_autocomplete():
     if cursor_pos is not None:
         cursor_pos = int(cursor_pos)
     
-    provider = AutocompleteProvider(dlfi)
+    provider = get_autocomplete_provider(dlfi)
     suggestions = provider.get_suggestions(query, cursor_pos)
     
     return jsonify({"suggestions": suggestions})
@@ -1126,11 +1334,15 @@ def get_settings():
 	"""Get current vault settings."""
 	dlfi = get_dlfi()
 	
-	return jsonify({
+	response = jsonify({
 		"encrypted": dlfi.config.encrypted,
 		"partition_size": dlfi.config.partition_size,
 		"partition_size_mb": dlfi.config.partition_size // (1024 * 1024) if dlfi.config.partition_size > 0 else 0
 	})
+	# Settings live in the config file rather than the database, so tag the body itself
+	response.add_etag()
+	response.headers["Cache-Control"] = "no-cache"
+	return response.make_conditional(request)
 
 
 @api_bp.route("/settings/encryption", methods=["POST"])
@@ -1146,62 +1358,58 @@ def update_encryption():
 	
 	config_manager = dlfi.config_manager
 	
-	try:
-		if action == "enable":
-			if dlfi.config.encrypted:
-				return jsonify({"error": "Vault is already encrypted"}), 400
-			if not new_password:
-				return jsonify({"error": "New password is required"}), 400
-			
-			success = config_manager.enable_encryption(new_password)
-			if success:
-				current_app.config["DLFI_PASSWORD"] = new_password
-				return jsonify({"success": True, "message": "Encryption enabled"})
-			else:
-				return jsonify({"error": "Failed to enable encryption"}), 500
+	if action == "enable":
+		if dlfi.config.encrypted:
+			return jsonify({"error": "Vault is already encrypted"}), 400
+		if not new_password:
+			return jsonify({"error": "New password is required"}), 400
 		
-		elif action == "disable":
-			if not dlfi.config.encrypted:
-				return jsonify({"error": "Vault is not encrypted"}), 400
-			if not current_password:
-				return jsonify({"error": "Current password is required"}), 400
-			
-			# Verify password first
-			stored_password = current_app.config.get("DLFI_PASSWORD")
-			if stored_password != current_password:
-				return jsonify({"error": "Incorrect password"}), 401
-			
-			success = config_manager.disable_encryption(current_password)
-			if success:
-				current_app.config["DLFI_PASSWORD"] = None
-				return jsonify({"success": True, "message": "Encryption disabled"})
-			else:
-				return jsonify({"error": "Failed to disable encryption"}), 500
+		success = config_manager.enable_encryption(new_password)
+		if success:
+			current_app.config["DLFI_PASSWORD"] = new_password
+			return jsonify({"success": True, "message": "Encryption enabled"})
+		else:
+			return jsonify({"error": "Failed to enable encryption"}), 500
+	
+	elif action == "disable":
+		if not dlfi.config.encrypted:
+			return jsonify({"error": "Vault is not encrypted"}), 400
+		if not current_password:
+			return jsonify({"error": "Current password is required"}), 400
 		
-		elif action == "change_password":
-			if not dlfi.config.encrypted:
-				return jsonify({"error": "Vault is not encrypted"}), 400
-			if not current_password or not new_password:
-				return jsonify({"error": "Both current and new passwords are required"}), 400
-			
-			# Verify password first
-			stored_password = current_app.config.get("DLFI_PASSWORD")
-			if stored_password != current_password:
-				return jsonify({"error": "Incorrect password"}), 401
-			
-			success = config_manager.change_password(current_password, new_password)
-			if success:
-				current_app.config["DLFI_PASSWORD"] = new_password
-				return jsonify({"success": True, "message": "Password changed"})
-			else:
-				return jsonify({"error": "Failed to change password"}), 500
+		# Verify password first
+		stored_password = current_app.config.get("DLFI_PASSWORD")
+		if stored_password != current_password:
+			return jsonify({"error": "Incorrect password"}), 401
 		
+		success = config_manager.disable_encryption(current_password)
+		if success:
+			current_app.config["DLFI_PASSWORD"] = None
+			return jsonify({"success": True, "message": "Encryption disabled"})
 		else:
-			return jsonify({"error": "Invalid action. Use: enable, disable, or change_password"}), 400
-			
-	except Exception as e:
-		logger.exception("Encryption settings error")
-		return jsonify({"error": str(e)}), 500
+			return jsonify({"error": "Failed to disable encryption"}), 500
+	
+	elif action == "change_password":
+		if not dlfi.config.encrypted:
+			return jsonify({"error": "Vault is not encrypted"}), 400
+		if not current_password or not new_password:
+			return jsonify({"error": "Both current and new passwords are required"}), 400
+		
+		# Verify password first
+		stored_password = current_app.config.get("DLFI_PASSWORD")
+		if stored_password != current_password:
+			return jsonify({"error": "Incorrect password"}), 401
+		
+		success = config_manager.change_password(current_password, new_password)
+		if success:
+			current_app.config["DLFI_PASSWORD"] = new_password
+			return jsonify({"success": True, "message": "Password changed"})
+		else:
+			return jsonify({"error": "Failed to change password"}), 500
+	
+	else:
+		return jsonify({"error": "Invalid action. Use: enable, disable, or change_password"}), 400
+		
 
 
 @api_bp.route("/settings/partition", methods=["POST"])
@@ -1226,20 +1434,16 @@ def update_partition():
 	
 	size_bytes = size_mb * 1024 * 1024 if size_mb > 0 else 0
 	
-	try:
-		config_manager = dlfi.config_manager
-		success = config_manager.change_partition_size(size_bytes)
-		
-		if success:
-			return jsonify({
-				"success": True,
-				"message": f"Partition size set to {size_mb}MB" if size_mb > 0 else "Partitioning disabled"
-			})
-		else:
-			return jsonify({"error": "Failed to change partition size"}), 500
-	except Exception as e:
-		logger.exception("Partition settings error")
-		return jsonify({"error": str(e)}), 500
+	config_manager = dlfi.config_manager
+	success = config_manager.change_partition_size(size_bytes)
+	
+	if success:
+		return jsonify({
+			"success": True,
+			"message": f"Partition size set to {size_mb}MB" if size_mb > 0 else "Partitioning disabled"
+		})
+	else:
+		return jsonify({"error": "Failed to change partition size"}), 500
 
 
 # ============ Extractors ============
@@ -1268,23 +1472,26 @@ def list_extractors():
 @api_bp.route("/extractors/<slug>/config", methods=["GET"])
 def get_extractor_config(slug: str):
 	"""Get default configuration for an extractor."""
-	try:
-		import extractors
-		
-		for extractor in extractors.AVAILABLE_EXTRACTORS:
-			ext_slug = getattr(extractor, 'slug', extractor.name.lower())
-			if ext_slug == slug:
-				config = extractor.default_config()
-				return jsonify({
-					"name": extractor.name,
-					"slug": ext_slug,
-					"config": config
-				})
-		
-		return jsonify({"error": "Extractor not found"}), 404
-	except Exception as e:
-		logger.exception("Failed to get extractor config")
-		return jsonify({"error": str(e)}), 500
+	import extractors
+	
+	for extractor in extractors.AVAILABLE_EXTRACTORS:
+		ext_slug = getattr(extractor, 'slug', extractor.name.lower())
+		if ext_slug == slug:
+			config = extractor.default_config()
+			return jsonify({
+				"name": extractor.name,
+				"slug": ext_slug,
+				"config": config
+			})
+	
+	return jsonify({"error": "Extractor not found"}), 404
+
+
+def log_job_failure(future):
+	"""Log an extractor job's exception when it finishes, rather than on every poll."""
+	error = future.exception()
+	if error is not None:
+		logger.error("Extractor job failed", exc_info=error)
 
 
 @api_bp.route("/extractors/run", methods=["POST"])
@@ -1304,8 +1511,40 @@ def run_extractor():
 		return jsonify({"error": "URL is required"}), 400
 	
 	job = Job(JobConfig(cookies=cookies_path), db = dlfi)
-	result = job.run(url.strip(), extr_config=config)
+	future = current_app.config["EXTRACTOR_POOL"].submit(job.run, url.strip(), extr_config=config)
+	future.add_done_callback(log_job_failure)
+	
+	jobs = current_app.config["EXTRACTOR_JOBS"]
+	job_id = secrets.token_hex(16)
+	jobs[job_id] = (dlfi.instance_id, future)
+	
+	# Forget the oldest finished jobs once enough have piled up
+	finished = [key for key, (_, f) in jobs.items() if f.done()]
+	for key in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+		jobs.pop(key, None)
+	
+	return jsonify({"job_id": job_id}), 202
+
+
+@api_bp.route("/extractors/jobs/<job_id>", methods=["GET"])
+def get_extractor_job(job_id: str):
+	"""Report the state of an extractor run started by /extractors/run."""
+	job = current_app.config["EXTRACTOR_JOBS"].get(job_id)
+	if job is None:
+		return jsonify({"error": "Job not found"}), 404
+	
+	_, future = job
+	if not future.done():
+		return jsonify({"state": "running"})
+	
+	# Failures were logged once by log_job_failure; polls only report them
+	error = future.exception()
+	if error is not None:
+		return jsonify({"state": "error", "error": str(error)})
+	result = future.result()
+	
 	return jsonify({
+		"state": "done",
 		"success": result.success,
 		"nodes_created": result.new_records + result.new_vaults,
 		"files_added": result.new_files,
@@ -1319,26 +1558,19 @@ def get_node_preview(uuid: str):
 	"""Get preview info for a node (first previewable file)."""
 	dlfi = get_dlfi()
 	
-	cursor = dlfi.conn.execute("""
-		SELECT nf.file_hash, b.ext, b.size_bytes
-		FROM node_files nf
-		JOIN blobs b ON nf.file_hash = b.hash
-		WHERE nf.node_uuid = ?
-		ORDER BY nf.display_order
-		LIMIT 1
-	""", (uuid,))
-	
-	row = cursor.fetchone()
+	with dlfi.read_conn() as conn:
+		row = conn.execute(SQL_FIRST_FILE, (uuid,)).fetchone()
 	if not row:
 		return jsonify({"has_preview": False})
 	
 	file_hash, ext, size = row
-	previewable = ext in ('jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'mp4', 'webm', 'mov')
+	is_video = ext in PREVIEW_VIDEO_EXTS
+	previewable = is_video or ext in PREVIEW_IMAGE_EXTS
 	
 	return jsonify({
 		"has_preview": previewable,
 		"hash": file_hash if previewable else None,
 		"ext": ext,
 		"size": size,
-		"is_video": ext in ('mp4', 'webm', 'mov')
+		"is_video": is_video
 	})
\ No newline at end of file
@@ -1,12 +1,50 @@
+import gzip
+import hashlib
 import json
 import logging
 from pathlib import Path
-from flask import Blueprint, render_template, current_app, redirect, url_for, request, session
+from typing import Callable
+from flask import Blueprint, Response, render_template, current_app, redirect, url_for, request, session
+from dlfi_server.routes.api import has_running_jobs
 
 logger = logging.getLogger(__name__)
 
 views_bp = Blueprint("views", __name__)
 
+# key -> (etag, html bytes, gzipped html bytes)
+_page_cache = {}
+_PAGE_CACHE_SIZE = 16
+
+
+def cached_page(key: tuple, render: Callable[[], str]) -> Response:
+	"""
+	Serve a page whose HTML depends only on `key`.
+	It is rendered, encoded and gzip-compressed once; later loads get a 304
+	or the stored bytes. Debug mode always re-renders so template edits show up.
+	"""
+	entry = _page_cache.get(key)
+	if entry is None or current_app.debug:
+		body = render().encode("utf-8")
+		entry = (hashlib.blake2b(body, digest_size=8).hexdigest(), body, gzip.compress(body, 9))
+		if len(_page_cache) >= _PAGE_CACHE_SIZE:
+			_page_cache.clear()
+		_page_cache[key] = entry
+	
+	etag, body, compressed = entry
+	if request.if_none_match.contains_weak(etag):
+		response = Response(status=304)
+	elif request.accept_encodings["gzip"]:
+		response = Response(compressed, mimetype="text/html")
+		response.headers["Content-Encoding"] = "gzip"
+	else:
+		response = Response(body, mimetype="text/html")
+	
+	response.set_etag(etag)
+	response.vary.add("Accept-Encoding")
+	# Revalidate each time: the page redirects home once the vault is closed
+	response.headers["Cache-Control"] = "no-cache"
+	return response
+
 
 def get_vault_info(vault_path: Path) -> dict:
 	"""Get info about a vault from its path."""
@@ -78,12 +116,16 @@ def vault_view():
 	vault_path = str(dlfi.root)
 	encrypted = dlfi.config.encrypted
 	
-	return render_template(
+	response = cached_page(("vault", vault_path, encrypted), lambda: render_template(
 		"vault.html",
 		vault_name=vault_name,
 		vault_path=vault_path,
 		encrypted=encrypted
-	)
+	))
+	# The script sits at the end of the body; announce it up front so its
+	# download overlaps the HTML transfer
+	response.headers["Link"] = f"<{url_for('static', filename='js/main.js')}>; rel=preload; as=script"
+	return response
 
 
 @views_bp.route("/close")
@@ -92,6 +134,10 @@ def close_vault():
 	dlfi = current_app.config.get("DLFI_INSTANCE")
 	
 	if dlfi is not None:
+		if has_running_jobs(dlfi):
+			# Closing would pull the database out from under the extractor;
+			# stay on the vault, whose extractor dialog shows the run
+			return redirect(url_for("views.vault_view"))
 		try:
 			dlfi.close()
 		except:
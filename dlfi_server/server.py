@@ -1,13 +1,20 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 from flask import Flask
+from werkzeug.serving import WSGIRequestHandler
 
 from .config import ServerConfig
 
 logger = logging.getLogger(__name__)
 
 
+class NoDelayRequestHandler(WSGIRequestHandler):
+	"""Request handler that sets TCP_NODELAY, so small JSON responses aren't held back by Nagle."""
+	disable_nagle_algorithm = True
+
+
 def create_app(config: Optional[ServerConfig] = None) -> Flask:
 	"""Create and configure the Flask application."""
 	if config is None:
@@ -18,20 +25,39 @@ def create_app(config: Optional[ServerConfig] = None) -> Flask:
 	template_dir = server_dir / "templates"
 	static_dir = server_dir / "static"
 	
+	# Static files are served by StaticAssets rather than Flask's default
+	# handler, so they can be precompressed and cached under hashed URLs
 	app = Flask(
 		__name__,
 		template_folder=str(template_dir),
-		static_folder=str(static_dir),
-		static_url_path="/static"
+		static_folder=None
 	)
 	
+	from .assets import StaticAssets
+	assets = StaticAssets(static_dir, reload=config.debug)
+	app.add_url_rule("/static/<path:filename>", endpoint="static", view_func=assets.serve)
+	app.url_defaults(assets.url_defaults)
+	
 	# Configure app
 	app.config["SECRET_KEY"] = config.secret_key
 	app.config["MAX_CONTENT_LENGTH"] = config.max_upload_size
+	app.config["MAX_FORM_PARTS"] = config.max_form_parts
 	app.config["DLFI_CONFIG"] = config
 	app.config["DLFI_INSTANCE"] = None  # Will hold the active DLFI instance
 	app.config["DLFI_PASSWORD"] = None  # Will hold the password for encrypted vaults
 	
+	# Extractor runs can take minutes; they go to a pool and are polled by id
+	app.config["EXTRACTOR_POOL"] = ThreadPoolExecutor(
+		max_workers=config.extractor_workers,
+		thread_name_prefix="dlfi-extractor"
+	)
+	app.config["EXTRACTOR_JOBS"] = {}  # job id -> (DLFI.instance_id, future)
+	
+	# Use orjson for request/response bodies when installed
+	from .json_provider import OrjsonProvider
+	if OrjsonProvider.available:
+		app.json = OrjsonProvider(app)
+	
 	# Register blueprints
 	from .routes.views import views_bp
 	from .routes.api import api_bp
@@ -39,6 +65,9 @@ def create_app(config: Optional[ServerConfig] = None) -> Flask:
 	app.register_blueprint(views_bp)
 	app.register_blueprint(api_bp, url_prefix="/api")
 	
+	from .compression import compress_response
+	app.after_request(compress_response)
+	
 	logger.info(f"DLFI Server initialized (templates: {template_dir}, static: {static_dir})")
 	
 	return app
@@ -53,9 +82,22 @@ def run_server(config: Optional[ServerConfig] = None):
 	
 	logger.info(f"Starting DLFI Server on http://{config.host}:{config.port}")
 	
+	# Prefer waitress when installed: its event loop multiplexes socket I/O and
+	# hands requests to a worker pool, instead of one thread per connection.
+	# The debug reloader only works with the built-in server.
+	if not config.debug:
+		try:
+			from waitress import serve
+		except ImportError:
+			logger.info("waitress not installed, using the built-in development server")
+		else:
+			serve(app, host=config.host, port=config.port, threads=config.threads)
+			return
+	
 	app.run(
 		host=config.host,
 		port=config.port,
 		debug=config.debug,
-		threaded=True
+		threaded=True,
+		request_handler=NoDelayRequestHandler
 	)
\ No newline at end of file
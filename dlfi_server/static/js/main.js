@@ -3,11 +3,42 @@
  * DLFI Server - Frontend Application with Query System
  */
 
+const IMAGE_EXTS = new Set(['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp']);
+const VIDEO_EXTS = new Set(['mp4', 'webm', 'mov']);
+
+const SIZE_UNITS = ['B', 'KB', 'MB', 'GB', 'TB'];
+
+const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+
+// Files uploaded at once; each goes in its own request so progress is per file
+const UPLOAD_CONCURRENCY = 4;
+
+// Images fetched as soon as a node's details arrive, before the panel is built
+const PRELOAD_IMAGES = 4;
+
+// Query results are reused for repeated queries until data changes or they age out
+const QUERY_CACHE_SIZE = 32;
+const QUERY_CACHE_TTL = 30000;
+const QUERY_DEBOUNCE_MS = 150;
+
+// File cards rendered per batch in the detail panel; the rest stream in on scroll
+const FILE_CARD_BATCH = 48;
+
+// How often a running extractor job is checked on
+const EXTRACTOR_POLL_MS = 1000;
+
 const App = {
 	currentNode: null,
 	nodes: [],
 	treeNodes: [],
+	activeTreeItem: null,
+	treeItems: new Map(),
+	preloadedImages: new Set(),
+	fileCardObserver: null,
 	queryResults: [],
+	queryCache: new Map(),
+	querySeq: 0,
+	queryTimer: null,
 	autocompleteTimeout: null,
 	autocompleteIndex: -1,
 	currentView: 'gallery',
@@ -36,6 +67,64 @@ const App = {
 	 * Bind global event handlers
 	 */
 	bindEvents() {
+		// One delegated listener for the whole tree; rows carry their uuid in data-uuid
+		document.getElementById('treeView')?.addEventListener('click', (e) => {
+			const item = e.target.closest('.tree-item');
+			if (item) this.selectNodeFromTree(item.dataset.uuid);
+		});
+		
+		// Rendered buttons and links carry their arguments in data-* attributes
+		// and are dispatched from here, instead of each one compiling an inline
+		// handler (and server values never pass through an inline JS string)
+		document.addEventListener('click', (e) => {
+			const el = e.target.closest('[data-action]');
+			if (!el) return;
+			const d = el.dataset;
+			switch (d.action) {
+				case 'open-file': this.openFile(d.hash, d.ext, d.name); break;
+				case 'remove-tag': this.removeTag(d.tag); break;
+				case 'query-path': this.queryPath(d.path); break;
+				case 'remove-relationship': this.removeRelationship(d.uuid, d.relation, d.direction); break;
+				case 'select-node': this.selectNode(d.uuid); break;
+				case 'close-detail': this.closeDetail(); break;
+				case 'delete-node': this.deleteNode(); break;
+				case 'edit-metadata': this.showMetadataEditor(); break;
+				case 'add-tag': this.showAddTag(); break;
+				case 'add-relationship': this.showAddRelationshipModal(); break;
+				case 'upload': this.showUploadFile(); break;
+				case 'bulk-edit': this.showBulkEditModal(); break;
+				case 'clear-selection': this.clearSelection(); break;
+			}
+		});
+		
+		// Query results: one listener each for every gallery/list item
+		const results = document.getElementById('queryResults');
+		if (results) {
+			const itemOf = (e) => e.target.closest('.gallery-item, .result-item');
+			results.addEventListener('click', (e) => {
+				const item = itemOf(e);
+				if (item) this.handleItemClick(item.dataset.uuid, item, e);
+			});
+			results.addEventListener('contextmenu', (e) => {
+				const item = itemOf(e);
+				if (item) this.handleItemContextMenu(item.dataset.uuid, item, e);
+			});
+			// mouseenter/leave don't bubble, but do reach ancestors in the capture phase
+			results.addEventListener('mouseenter', (e) => {
+				if (e.target.tagName === 'VIDEO') e.target.play();
+			}, true);
+			results.addEventListener('mouseleave', (e) => {
+				if (e.target.tagName === 'VIDEO') e.target.pause();
+			}, true);
+		}
+		
+		// Swap broken thumbnails for an icon; error events are caught while capturing
+		document.getElementById('detailBody')?.addEventListener('error', (e) => {
+			if (e.target.tagName === 'IMG' && e.target.parentElement?.classList.contains('file-preview')) {
+				e.target.parentElement.innerHTML = '<span class="file-icon">🖼️</span>';
+			}
+		}, true);
+		
 		document.querySelectorAll('.modal-overlay').forEach(overlay => {
 			overlay.addEventListener('click', (e) => {
 				if (e.target === overlay) {
@@ -305,11 +394,15 @@ const App = {
 	},
 	
 	async loadTree() {
+		// Everything that reloads the tree has changed (or may have changed)
+		// data; this runs before the first await, so a query started
+		// alongside it in Promise.all won't see stale results
+		this.invalidateQueries();
 		try {
-			const resp = await fetch('/api/nodes');
+			const resp = await fetch('/api/nodes?format=columns');
 			if (!resp.ok) throw new Error('Failed to load nodes');
-			const data = await resp.json();
-			this.treeNodes = data.nodes;
+			const { columns, rows } = await resp.json();
+			this.treeNodes = rows.map(row => Object.fromEntries(columns.map((col, i) => [col, row[i]])));
 			this.renderTree();
 		} catch (e) {
 			console.error('Failed to load tree:', e);
@@ -327,58 +420,106 @@ const App = {
 		
 		if (!this.treeNodes.length) {
 			tree.innerHTML = `<div class="tree-empty">No items yet</div>`;
+			this.treeItems.clear();
+			this.activeTreeItem = null;
 			return;
 		}
 		
-		tree.innerHTML = '';
-		const rootNodes = this.treeNodes.filter(n => !n.parent);
+		// Group children by parent once instead of filtering the whole list per node
+		const childrenOf = new Map();
+		for (const n of this.treeNodes) {
+			const key = n.parent || null;
+			if (!childrenOf.has(key)) childrenOf.set(key, []);
+			childrenOf.get(key).push(n);
+		}
+		const byTypeThenName = (a, b) => {
+			if (a.type !== b.type) return a.type === 'VAULT' ? -1 : 1;
+			return a.name.localeCompare(b.name);
+		};
+		
+		this.activeTreeItem = null;
+		// Rows by uuid; rebuilt on every render so removed nodes don't linger
+		this.treeItems = new Map();
+		
+		// Build rows off-document and insert them in one go
+		const frag = document.createDocumentFragment();
+		
+		// Rows are cloned from a pre-parsed template and filled via textContent
+		const row = document.getElementById('treeItemTpl').content.firstElementChild;
 		
 		const renderNode = (node, depth = 0) => {
-			const div = document.createElement('div');
-			div.className = `tree-item ${node.type.toLowerCase()}`;
+			const div = row.cloneNode(true);
+			div.classList.add(node.type.toLowerCase());
 			div.style.paddingLeft = `${12 + depth * 14}px`;
 			div.dataset.uuid = node.uuid;
-			const icon = node.type === 'VAULT' ? '📁' : '📄';
-			const badge = node.file_count > 0 ? `<span class="tree-badge">${node.file_count}</span>` : '';
-			div.innerHTML = `<span class="tree-icon">${icon}</span><span class="tree-name">${this.escapeHtml(node.name)}</span>${badge}`;
-			div.addEventListener('click', (e) => {
-				e.stopPropagation();
-				this.selectNodeFromTree(node.uuid);
-			});
-			tree.appendChild(div);
+			this.treeItems.set(node.uuid, div);
+			const [icon, name, badge] = div.children;
+			icon.textContent = node.type === 'VAULT' ? '📁' : '📄';
+			name.textContent = node.name;
+			if (node.file_count > 0) badge.textContent = node.file_count;
+			else badge.remove();
+			if (node.uuid === this.currentNode?.uuid) {
+				div.classList.add('active');
+				this.activeTreeItem = div;
+			}
+			frag.appendChild(div);
 			
-			const children = this.treeNodes.filter(n => n.parent === node.uuid);
-			children.sort((a, b) => {
-				if (a.type !== b.type) return a.type === 'VAULT' ? -1 : 1;
-				return a.name.localeCompare(b.name);
-			});
+			const children = childrenOf.get(node.uuid) || [];
+			children.sort(byTypeThenName);
 			children.forEach(child => renderNode(child, depth + 1));
 		};
 		
-		rootNodes.sort((a, b) => {
-			if (a.type !== b.type) return a.type === 'VAULT' ? -1 : 1;
-			return a.name.localeCompare(b.name);
-		});
+		const rootNodes = childrenOf.get(null) || [];
+		rootNodes.sort(byTypeThenName);
 		rootNodes.forEach(node => renderNode(node));
+		
+		tree.replaceChildren(frag);
+	},
+	
+	/**
+	 * Highlight the tree row for a node, clearing only the previously active row
+	 */
+	setActiveTreeItem(uuid) {
+		this.activeTreeItem?.classList.remove('active');
+		const el = this.treeItems.get(uuid) || null;
+		el?.classList.add('active');
+		this.activeTreeItem = el;
 	},
 	
 	selectNodeFromTree(uuid) {
 		const node = this.treeNodes.find(n => n.uuid === uuid);
 		if (!node) return;
-		document.querySelectorAll('.tree-item').forEach(el => {
-			el.classList.toggle('active', el.dataset.uuid === uuid);
-		});
+		this.setActiveTreeItem(uuid);
 		const input = document.getElementById('queryInput');
 		if (input) {
 			input.value = `inside:${node.path}`;
-			this.executeQuery(input.value);
+			this.scheduleQuery(input.value);
 		}
 		this.selectNode(uuid);
 	},
 	
+	/**
+	 * Run a query after a short pause, so rapid clicks collapse into one request
+	 */
+	scheduleQuery(query) {
+		clearTimeout(this.queryTimer);
+		this.queryTimer = setTimeout(() => this.executeQuery(query), QUERY_DEBOUNCE_MS);
+	},
+	
+	invalidateQueries() {
+		this.queryCache.clear();
+	},
+	
 	async executeQuery(query) {
+		clearTimeout(this.queryTimer);
+		const seq = ++this.querySeq;
 		const resultsContainer = document.getElementById('queryResults');
-		const statsContainer = document.getElementById('queryStats');
+		
+		const cached = this.queryCache.get(query);
+		if (cached && Date.now() - cached.time < QUERY_CACHE_TTL) {
+			this.showQueryResults(cached.data);
+			return;
+		}
 		
 		if (resultsContainer) {
 			resultsContainer.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
@@ -392,14 +533,17 @@ const App = {
 			});
 			const data = await resp.json();
 			if (!resp.ok) throw new Error(data.error || 'Query failed');
+			// A newer query was started while this one was in flight
+			if (seq !== this.querySeq) return;
 			
-			this.queryResults = data.nodes;
-			this.renderQueryResults(data);
-			
-			if (statsContainer) {
-				statsContainer.textContent = `${data.total} results (${data.query_time_ms}ms)`;
+			this.queryCache.delete(query);
+			if (this.queryCache.size >= QUERY_CACHE_SIZE) {
+				this.queryCache.delete(this.queryCache.keys().next().value);
 			}
+			this.queryCache.set(query, { data, time: Date.now() });
+			this.showQueryResults(data);
 		} catch (e) {
+			if (seq !== this.querySeq) return;
 			console.error('Query failed:', e);
 			if (resultsContainer) {
 				resultsContainer.innerHTML = `
@@ -412,6 +556,16 @@ const App = {
 		}
 	},
 	
+	showQueryResults(data) {
+		this.queryResults = data.nodes;
+		this.renderQueryResults(data);
+		
+		const statsContainer = document.getElementById('queryStats');
+		if (statsContainer) {
+			statsContainer.textContent = `${data.total} results (${data.query_time_ms}ms${data.cached ? ', cached' : ''})`;
+		}
+	},
+	
 	renderQueryResults(data) {
 		const container = document.getElementById('queryResults');
 		if (!container) return;
@@ -450,10 +604,7 @@ const App = {
 		const isSelected = this.selectedNodes.has(node.uuid) ? 'selected' : '';
 		
 		return `
-			<div class="gallery-item ${isSelected}" 
-				data-uuid="${node.uuid}"
-				onclick="App.handleItemClick('${node.uuid}', this, event)"
-				oncontextmenu="App.handleItemContextMenu('${node.uuid}', this, event)">
+			<div class="gallery-item ${isSelected}" data-uuid="${node.uuid}">
 				${preview}
 				<div class="gallery-info">
 					<div class="gallery-name" title="${this.escapeAttr(node.name)}">${this.escapeHtml(node.name)}</div>
@@ -477,7 +628,7 @@ const App = {
 			
 			if (data.has_preview && data.hash) {
 				if (data.is_video) {
-					container.innerHTML = `<video src="/api/blobs/${data.hash}" muted loop onmouseenter="this.play()" onmouseleave="this.pause()"></video>`;
+					container.innerHTML = `<video src="/api/blobs/${data.hash}" muted loop></video>`;
 				} else {
 					container.innerHTML = `<img src="/api/blobs/${data.hash}" alt="" loading="lazy">`;
 				}
@@ -497,10 +648,7 @@ const App = {
 		const isSelected = this.selectedNodes.has(node.uuid) ? 'selected' : '';
 		
 		return `
-			<div class="result-item ${isSelected}"
-				data-uuid="${node.uuid}"
-				onclick="App.handleItemClick('${node.uuid}', this, event)"
-				oncontextmenu="App.handleItemContextMenu('${node.uuid}', this, event)">
+			<div class="result-item ${isSelected}" data-uuid="${node.uuid}">
 				<div class="result-icon">${icon}</div>
 				<div class="result-content">
 					<div class="result-name">${this.escapeHtml(node.name)}</div>
@@ -543,23 +691,58 @@ const App = {
 	},
 	
 	async selectNode(uuid) {
-		document.querySelectorAll('.tree-item').forEach(el => {
-			el.classList.toggle('active', el.dataset.uuid === uuid);
-		});
+		this.setActiveTreeItem(uuid);
+		
+		// Relationships don't depend on the node body, so fetch both at once
+		const relRequest = fetch(`/api/nodes/${uuid}/relationships`)
+			.then(r => r.json())
+			.catch(e => {
+				console.error('Failed to load relationships:', e);
+				return { outgoing: [], incoming: [] };
+			});
 		
 		try {
 			const resp = await fetch(`/api/nodes/${uuid}`);
 			if (!resp.ok) throw new Error('Failed to load node');
 			const node = await resp.json();
 			this.currentNode = node;
-			this.renderNodeDetail(node);
+			this.preloadNodeImages(node);
+			this.renderNodeDetail(node, await relRequest);
 		} catch (e) {
 			console.error('Failed to load node:', e);
 			this.showError('Failed to load node details');
 		}
 	},
 	
-	async renderNodeDetail(node) {
+	/**
+	 * Start fetching the hero image and first thumbnails while the rest of
+	 * the detail panel (relationships) is still loading
+	 */
+	preloadNodeImages(node) {
+		const files = node.files || [];
+		const urls = [];
+		if (files.length && IMAGE_EXTS.has(files[0].ext)) {
+			urls.push(`/api/blobs/${files[0].hash}`);
+		}
+		for (const f of files.slice(1)) {
+			if (urls.length >= PRELOAD_IMAGES) break;
+			if (IMAGE_EXTS.has(f.ext)) urls.push(`/api/blobs/${f.hash}/thumbnail`);
+		}
+		
+		for (const url of urls) {
+			if (this.preloadedImages.has(url)) continue;
+			this.preloadedImages.add(url);
+			const link = document.createElement('link');
+			link.rel = 'preload';
+			link.as = 'image';
+			link.href = url;
+			// The fetched image stays in the memory cache; drop the tag itself
+			link.onload = link.onerror = () => link.remove();
+			document.head.appendChild(link);
+		}
+	},
+	
+	async renderNodeDetail(node, relData = null) {
 		const panel = document.getElementById('detailPanel');
 		if (!panel) return;
 		panel.classList.remove('hidden');
@@ -572,19 +755,21 @@ const App = {
 				<div class="detail-breadcrumb">${this.escapeHtml(node.path)}</div>
 				<h2 class="detail-title">${this.escapeHtml(node.name)}</h2>
 				<div class="detail-toolbar">
-					<button class="btn btn-sm btn-secondary" onclick="App.closeDetail()">Close</button>
-					<button class="btn btn-sm btn-danger" onclick="App.deleteNode()">Delete</button>
+					<button class="btn btn-sm btn-secondary" data-action="close-detail">Close</button>
+					<button class="btn btn-sm btn-danger" data-action="delete-node">Delete</button>
 				</div>
 			`;
 		}
 		
-		// Fetch relationship data
-		let relData = { outgoing: [], incoming: [] };
-		try {
-			const relResp = await fetch(`/api/nodes/${node.uuid}/relationships`);
-			relData = await relResp.json();
-		} catch (e) {
-			console.error('Failed to load relationships:', e);
+		// Fetch relationship data unless the caller already has it
+		if (!relData) {
+			relData = { outgoing: [], incoming: [] };
+			try {
+				const relResp = await fetch(`/api/nodes/${node.uuid}/relationships`);
+				relData = await relResp.json();
+			} catch (e) {
+				console.error('Failed to load relationships:', e);
+			}
 		}
 		
 		let html = `<div class="detail-type-badge ${node.type.toLowerCase()}">${node.type}</div>`;
@@ -592,11 +777,11 @@ const App = {
 		// Hero preview
 		if (node.files?.length > 0) {
 			const firstFile = node.files[0];
-			const isImage = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'].includes(firstFile.ext);
-			const isVideo = ['mp4', 'webm', 'mov'].includes(firstFile.ext);
+			const isImage = IMAGE_EXTS.has(firstFile.ext);
+			const isVideo = VIDEO_EXTS.has(firstFile.ext);
 			if (isImage || isVideo) {
 				html += `
-					<div class="hero-preview" onclick="App.openFile('${firstFile.hash}', '${firstFile.ext}', '${this.escapeAttr(firstFile.name)}')">
+					<div class="hero-preview" data-action="open-file" data-hash="${firstFile.hash}" data-ext="${this.escapeAttr(firstFile.ext)}" data-name="${this.escapeAttr(firstFile.name)}">
 						${isImage ? `<img src="/api/blobs/${firstFile.hash}" alt="${this.escapeAttr(firstFile.name)}">` : `<video src="/api/blobs/${firstFile.hash}" controls></video>`}
 					</div>
 				`;
@@ -608,7 +793,7 @@ const App = {
 			<div class="panel">
 				<div class="panel-header">
 					<span class="panel-title">Metadata</span>
-					<button class="btn btn-sm btn-secondary" onclick="App.showMetadataEditor()">Edit</button>
+					<button class="btn btn-sm btn-secondary" data-action="edit-metadata">Edit</button>
 				</div>
 				<div class="panel-body">
 					${Object.keys(node.metadata).length > 0 ? `<div class="meta-tree">${this.renderMetadataTree(node.metadata)}</div>` : '<p class="text-muted">No metadata</p>'}
@@ -621,10 +806,10 @@ const App = {
 			<div class="panel">
 				<div class="panel-header">
 					<span class="panel-title">Tags</span>
-					<button class="btn btn-sm btn-secondary" onclick="App.showAddTag()">Add</button>
+					<button class="btn btn-sm btn-secondary" data-action="add-tag">Add</button>
 				</div>
 				<div class="panel-body">
-					${node.tags.length > 0 ? `<div class="tags">${node.tags.map(t => `<span class="tag">${this.escapeHtml(t)}<span class="tag-remove" onclick="App.removeTag('${this.escapeAttr(t)}')">&times;</span></span>`).join('')}</div>` : '<p class="text-muted">No tags</p>'}
+					${node.tags.length > 0 ? `<div class="tags">${node.tags.map(t => `<span class="tag">${this.escapeHtml(t)}<span class="tag-remove" data-action="remove-tag" data-tag="${this.escapeAttr(t)}">&times;</span></span>`).join('')}</div>` : '<p class="text-muted">No tags</p>'}
 				</div>
 			</div>
 		`;
@@ -634,7 +819,7 @@ const App = {
 			<div class="panel">
 				<div class="panel-header">
 					<span class="panel-title">Relationships</span>
-					<button class="btn btn-sm btn-secondary" onclick="App.showAddRelationshipModal()">Add</button>
+					<button class="btn btn-sm btn-secondary" data-action="add-relationship">Add</button>
 				</div>
 				<div class="panel-body">
 		`;
@@ -646,9 +831,9 @@ const App = {
 					<div class="rel-item">
 						<span class="rel-type">${this.escapeHtml(r.relation)}</span>
 						<span class="rel-arrow">→</span>
-						<span class="rel-target" onclick="App.queryPath('${this.escapeAttr(r.target_path)}')">${this.escapeHtml(r.target_path)}</span>
+						<span class="rel-target" data-action="query-path" data-path="${this.escapeAttr(r.target_path)}">${this.escapeHtml(r.target_path)}</span>
 						<div class="rel-actions">
-							<button class="rel-remove" onclick="App.removeRelationship('${r.target_uuid}', '${this.escapeAttr(r.relation)}', 'outgoing')" title="Remove">×</button>
+							<button class="rel-remove" data-action="remove-relationship" data-uuid="${r.target_uuid}" data-relation="${this.escapeAttr(r.relation)}" data-direction="outgoing" title="Remove">×</button>
 						</div>
 					</div>
 				`;
@@ -661,12 +846,12 @@ const App = {
 			for (const r of relData.incoming) {
 				html += `
 					<div class="rel-item">
-						<span class="rel-target" onclick="App.queryPath('${this.escapeAttr(r.source_path)}')">${this.escapeHtml(r.source_path)}</span>
+						<span class="rel-target" data-action="query-path" data-path="${this.escapeAttr(r.source_path)}">${this.escapeHtml(r.source_path)}</span>
 						<span class="rel-arrow">→</span>
 						<span class="rel-type">${this.escapeHtml(r.relation)}</span>
 						<span class="rel-direction">(incoming)</span>
 						<div class="rel-actions">
-							<button class="rel-remove" onclick="App.removeRelationship('${r.source_uuid}', '${this.escapeAttr(r.relation)}', 'incoming')" title="Remove">×</button>
+							<button class="rel-remove" data-action="remove-relationship" data-uuid="${r.source_uuid}" data-relation="${this.escapeAttr(r.relation)}" data-direction="incoming" title="Remove">×</button>
 						</div>
 					</div>
 				`;
@@ -681,19 +866,20 @@ const App = {
 		html += `</div></div>`;
 		
 		// Files
+		let filesToShow = [];
 		if (node.files?.length > 0) {
 			const firstFile = node.files[0];
-			const isFirstPreviewable = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'mp4', 'webm', 'mov'].includes(firstFile.ext);
-			const filesToShow = isFirstPreviewable ? node.files.slice(1) : node.files;
+			const isFirstPreviewable = IMAGE_EXTS.has(firstFile.ext) || VIDEO_EXTS.has(firstFile.ext);
+			filesToShow = isFirstPreviewable ? node.files.slice(1) : node.files;
 			
 			html += `
 				<div class="panel">
 					<div class="panel-header">
 						<span class="panel-title">Files (${node.files.length})</span>
-						<button class="btn btn-sm btn-secondary" onclick="App.showUploadFile()">Upload</button>
+						<button class="btn btn-sm btn-secondary upload-btn" data-action="upload">Upload</button>
 					</div>
 					<div class="panel-body">
-						${filesToShow.length > 0 ? `<div class="files-grid">${filesToShow.map(f => this.renderFileCard(f)).join('')}</div>` : (isFirstPreviewable ? '<p class="text-muted">No additional files</p>' : '')}
+						${filesToShow.length > 0 ? `<div class="files-grid" id="detailFilesGrid"></div>` : (isFirstPreviewable ? '<p class="text-muted">No additional files</p>' : '')}
 					</div>
 				</div>
 			`;
@@ -702,7 +888,7 @@ const App = {
 				<div class="panel">
 					<div class="panel-header">
 						<span class="panel-title">Files</span>
-						<button class="btn btn-sm btn-secondary" onclick="App.showUploadFile()">Upload</button>
+						<button class="btn btn-sm btn-secondary upload-btn" data-action="upload">Upload</button>
 					</div>
 					<div class="panel-body"><p class="text-muted">No files attached</p></div>
 				</div>
@@ -717,7 +903,7 @@ const App = {
 					<div class="panel-body">
 						<div class="children-list">
 							${node.children.map(c => `
-								<div class="child-item" onclick="App.selectNode('${c.uuid}')">
+								<div class="child-item" data-action="select-node" data-uuid="${c.uuid}">
 									<span class="child-icon">${c.type === 'VAULT' ? '📁' : '📄'}</span>
 									<span class="child-name">${this.escapeHtml(c.name)}</span>
 									<span class="child-type">${c.type}</span>
@@ -729,7 +915,47 @@ const App = {
 			`;
 		}
 		
-		if (body) body.innerHTML = html;
+		this.fileCardObserver?.disconnect();
+		if (body) {
+			body.innerHTML = html;
+			const grid = document.getElementById('detailFilesGrid');
+			if (grid) this.streamFileCards(grid, filesToShow);
+		}
+	},
+	
+	/**
+	 * Fill a files grid in batches, appending the next batch when a sentinel
+	 * after the grid scrolls near the viewport
+	 */
+	streamFileCards(grid, files) {
+		let next = 0;
+		const appendBatch = () => {
+			const batch = files.slice(next, next + FILE_CARD_BATCH);
+			next += batch.length;
+			grid.insertAdjacentHTML('beforeend', batch.map(f => this.renderFileCard(f)).join(''));
+			return next < files.length;
+		};
+		
+		if (!appendBatch() || !('IntersectionObserver' in window)) {
+			while (next < files.length) appendBatch();
+			return;
+		}
+		
+		const sentinel = document.createElement('div');
+		grid.after(sentinel);
+		const observer = new IntersectionObserver((entries) => {
+			if (!entries.some(e => e.isIntersecting)) return;
+			if (appendBatch()) {
+				// Re-observe so a sentinel that is still visible fires again
+				observer.unobserve(sentinel);
+				observer.observe(sentinel);
+			} else {
+				observer.disconnect();
+				sentinel.remove();
+			}
+		}, { rootMargin: '400px' });
+		observer.observe(sentinel);
+		this.fileCardObserver = observer;
 	},
 	
 	renderMetadataTree(obj, depth = 0) {
@@ -787,8 +1013,10 @@ const App = {
 				throw new Error(data.error || 'Failed to save metadata');
 			}
 			document.getElementById('metadataEditorModal').classList.add('hidden');
-			await this.selectNode(this.currentNode.uuid);
-			await this.loadTree();
+			await Promise.all([
+				this.selectNode(this.currentNode.uuid),
+				this.loadTree()
+			]);
 		} catch (e) {
 			errorDiv.textContent = e.message;
 			errorDiv.classList.remove('hidden');
@@ -804,19 +1032,19 @@ const App = {
 		const input = document.getElementById('queryInput');
 		if (input) {
 			input.value = `inside:${path}`;
-			this.executeQuery(input.value);
+			this.scheduleQuery(input.value);
 		}
 	},
 	
 	renderFileCard(file) {
-		const isImage = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'].includes(file.ext);
-		const isVideo = ['mp4', 'webm', 'mov'].includes(file.ext);
+		const isImage = IMAGE_EXTS.has(file.ext);
+		const isVideo = VIDEO_EXTS.has(file.ext);
 		let preview = `<span class="file-icon">📎</span>`;
-		if (isImage) preview = `<img src="/api/blobs/${file.hash}/thumbnail" alt="" loading="lazy" onerror="this.parentElement.innerHTML='<span class=file-icon>🖼️</span>'">`;
+		if (isImage) preview = `<img src="/api/blobs/${file.hash}/thumbnail" alt="" loading="lazy" decoding="async">`;
 		else if (isVideo) preview = `<span class="file-icon">🎬</span>`;
 		
 		return `
-			<div class="file-card" onclick="App.openFile('${file.hash}', '${file.ext}', '${this.escapeAttr(file.name)}')">
+			<div class="file-card" data-action="open-file" data-hash="${file.hash}" data-ext="${this.escapeAttr(file.ext)}" data-name="${this.escapeAttr(file.name)}">
 				<div class="file-preview">${preview}</div>
 				<div class="file-info">
 					<div class="file-name" title="${this.escapeAttr(file.name)}">${this.escapeHtml(file.name)}</div>
@@ -827,8 +1055,8 @@ const App = {
 	},
 	
 	openFile(hash, ext, name) {
-		const isImage = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'].includes(ext);
-		const isVideo = ['mp4', 'webm', 'mov'].includes(ext);
+		const isImage = IMAGE_EXTS.has(ext);
+		const isVideo = VIDEO_EXTS.has(ext);
 		if (isImage || isVideo) {
 			const lightbox = document.getElementById('lightbox');
 			const content = document.getElementById('lightboxContent');
@@ -876,8 +1104,10 @@ const App = {
 			if (!resp.ok) throw new Error(data.error || 'Failed to create node');
 			
 			document.getElementById('createNodeModal').classList.add('hidden');
-			await this.loadTree();
-			await this.executeQuery(document.getElementById('queryInput')?.value || '');
+			await Promise.all([
+				this.loadTree(),
+				this.executeQuery(document.getElementById('queryInput')?.value || '')
+			]);
 			this.selectNode(data.uuid);
 		} catch (e) {
 			this.showError(e.message);
@@ -906,6 +1136,7 @@ const App = {
 			});
 			if (!resp.ok) throw new Error((await resp.json()).error || 'Failed to add tag');
 			document.getElementById('addTagModal').classList.add('hidden');
+			this.invalidateQueries();
 			await this.selectNode(this.currentNode.uuid);
 		} catch (e) {
 			this.showError(e.message);
@@ -922,6 +1153,7 @@ const App = {
 				body: JSON.stringify({ tags })
 			});
 			if (!resp.ok) throw new Error((await resp.json()).error || 'Failed to remove tag');
+			this.invalidateQueries();
 			await this.selectNode(this.currentNode.uuid);
 		} catch (e) {
 			this.showError(e.message);
@@ -937,22 +1169,75 @@ const App = {
 		input.multiple = true;
 		input.addEventListener('change', async () => {
 			if (!input.files.length) return;
-			for (const file of input.files) {
-				try {
-					const formData = new FormData();
-					formData.append('file', file);
-					const resp = await fetch(`/api/nodes/${this.currentNode.uuid}/files`, { method: 'POST', body: formData });
-					if (!resp.ok) throw new Error((await resp.json()).error || 'Upload failed');
-				} catch (e) {
-					this.showError(`Failed to upload ${file.name}: ${e.message}`);
+			const uuid = this.currentNode.uuid;
+			const files = [...input.files];
+			const totalBytes = files.reduce((sum, f) => sum + f.size, 0) || 1;
+			const loaded = new Map();
+			const failures = [];
+			
+			const showProgress = () => {
+				let done = 0;
+				for (const n of loaded.values()) done += n;
+				const pct = Math.floor(done * 100 / totalBytes);
+				document.querySelectorAll('#detailBody .upload-btn').forEach(btn => {
+					btn.disabled = true;
+					btn.textContent = `Uploading ${pct}%`;
+				});
+			};
+			showProgress();
+			
+			// A few workers drain the queue so reads, transfers and server-side
+			// hashing of different files overlap
+			const queue = [...files];
+			const worker = async () => {
+				while (queue.length) {
+					const file = queue.shift();
+					try {
+						await this.uploadOne(uuid, file, (n) => {
+							loaded.set(file, Math.min(n, file.size));
+							showProgress();
+						});
+					} catch (e) {
+						failures.push(`${file.name}: ${e.message}`);
+					}
+					loaded.set(file, file.size);
+					showProgress();
 				}
+			};
+			await Promise.all(Array.from({ length: Math.min(UPLOAD_CONCURRENCY, files.length) }, worker));
+			
+			if (failures.length) {
+				this.showError(`Failed to upload ${failures.length} file(s):\n${failures.join('\n')}`);
 			}
-			await this.loadTree();
-			await this.selectNode(this.currentNode.uuid);
+			await Promise.all([
+				this.loadTree(),
+				this.currentNode?.uuid === uuid && this.selectNode(uuid)
+			]);
 		});
 		input.click();
 	},
 	
+	/**
+	 * Upload a single file to a record, reporting bytes sent through onProgress
+	 */
+	uploadOne(uuid, file, onProgress) {
+		return new Promise((resolve, reject) => {
+			const xhr = new XMLHttpRequest();
+			xhr.open('POST', `/api/nodes/${uuid}/files`);
+			xhr.responseType = 'json';
+			xhr.upload.addEventListener('progress', (e) => onProgress(e.loaded));
+			xhr.addEventListener('load', () => {
+				const result = xhr.response || {};
+				if (xhr.status >= 200 && xhr.status < 300) resolve(result);
+				else reject(new Error(result.error || xhr.statusText || 'Upload failed'));
+			});
+			xhr.addEventListener('error', () => reject(new Error('Network error')));
+			const formData = new FormData();
+			formData.append('file', file);
+			xhr.send(formData);
+		});
+	},
+	
 	async deleteNode() {
 		if (!this.currentNode) return;
 		if (!confirm(`Delete "${this.currentNode.name}" and all its contents?`)) return;
@@ -961,8 +1246,10 @@ const App = {
 			const resp = await fetch(`/api/nodes/${this.currentNode.uuid}`, { method: 'DELETE' });
 			if (!resp.ok) throw new Error((await resp.json()).error || 'Failed to delete');
 			this.closeDetail();
-			await this.loadTree();
-			await this.executeQuery(document.getElementById('queryInput')?.value || '');
+			await Promise.all([
+				this.loadTree(),
+				this.executeQuery(document.getElementById('queryInput')?.value || '')
+			]);
 		} catch (e) {
 			this.showError(e.message);
 		}
@@ -1210,9 +1497,9 @@ const App = {
 					if (typeof value === 'boolean') {
 						inputHtml = `<select id="extcfg_${key}" class="form-input"><option value="false">No</option><option value="true" ${value ? 'selected' : ''}>Yes</option></select>`;
 					} else if (typeof value === 'number') {
-						inputHtml = `<input type="number" id="extcfg_${key}" class="form-input" value="${value}">`;
+						inputHtml = `<input type="number" id="extcfg_${key}" class="form-input" value="${this.escapeAttr(value)}">`;
 					} else if (Array.isArray(value)) {
-						inputHtml = `<input type="text" id="extcfg_${key}" class="form-input" value="${value.join(', ')}" placeholder="Comma-separated values">`;
+						inputHtml = `<input type="text" id="extcfg_${key}" class="form-input" value="${this.escapeAttr(value.join(', '))}" placeholder="Comma-separated values">`;
 					} else {
 						inputHtml = `<input type="text" id="extcfg_${key}" class="form-input" value="${this.escapeAttr(value || '')}">`;
 					}
@@ -1276,9 +1563,11 @@ const App = {
 				})
 			});
 			
-			const data = await resp.json();
+			const started = await resp.json();
 			
-			if (!resp.ok) throw new Error(data.error);
+			if (!resp.ok) throw new Error(started.error);
+			
+			const data = await this.waitForExtractorJob(started.job_id);
 			
 			let msg = `Created ${data.nodes_created} nodes, added ${data.files_added} files.`;
 			if (data.errors?.length > 0) {
@@ -1288,8 +1577,10 @@ const App = {
 			document.getElementById('extractorSuccess').textContent = msg;
 			document.getElementById('extractorSuccess').classList.remove('hidden');
 			
-			await this.loadTree();
-			await this.executeQuery('');
+			await Promise.all([
+				this.loadTree(),
+				this.executeQuery('')
+			]);
 		} catch (e) {
 			document.getElementById('extractorError').textContent = e.message;
 			document.getElementById('extractorError').classList.remove('hidden');
@@ -1299,24 +1590,37 @@ const App = {
 		}
 	},
 	
+	async waitForExtractorJob(jobId) {
+		// The run happens in the background on the server; poll until it settles
+		while (true) {
+			await new Promise(resolve => setTimeout(resolve, EXTRACTOR_POLL_MS));
+			const resp = await fetch(`/api/extractors/jobs/${encodeURIComponent(jobId)}`);
+			const data = await resp.json();
+			if (!resp.ok) throw new Error(data.error);
+			if (data.state === 'done') return data;
+			if (data.state === 'error') throw new Error(data.error);
+		}
+	},
+	
 	formatSize(bytes) {
 		if (!bytes) return '0 B';
-		const k = 1024;
-		const sizes = ['B', 'KB', 'MB', 'GB'];
-		const i = Math.floor(Math.log(bytes) / Math.log(k));
-		return parseFloat((bytes / Math.pow(k, i)).toFixed(1)) + ' ' + sizes[i];
+		// At most a few divisions; no logarithms per call
+		let value = bytes;
+		let i = 0;
+		while (value >= 1024 && i < SIZE_UNITS.length - 1) {
+			value /= 1024;
+			i++;
+		}
+		return parseFloat(value.toFixed(1)) + ' ' + SIZE_UNITS[i];
 	},
 	
 	escapeHtml(str) {
 		if (str === null || str === undefined) return '';
-		const div = document.createElement('div');
-		div.textContent = String(str);
-		return div.innerHTML;
+		return String(str).replace(/[&<>"']/g, c => HTML_ESCAPES[c]);
 	},
 	
 	escapeAttr(str) {
-		if (str === null || str === undefined) return '';
-		return String(str).replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+		return this.escapeHtml(str);
 	},
 	
 	showError(message) {
@@ -1376,8 +1680,8 @@ const App = {
 		bar.innerHTML = `
 			<span class="selection-count">${this.selectedNodes.size} selected</span>
 			<div class="selection-actions">
-				<button class="btn btn-sm btn-primary" onclick="App.showBulkEditModal()">Edit Selected</button>
-				<button class="btn btn-sm btn-secondary" onclick="App.clearSelection()">Clear</button>
+				<button class="btn btn-sm btn-primary" data-action="bulk-edit">Edit Selected</button>
+				<button class="btn btn-sm btn-secondary" data-action="clear-selection">Clear</button>
 			</div>
 		`;
 	},
@@ -1618,18 +1922,20 @@ const App = {
 			
 			this.closeBulkEditModal();
 			this.clearSelection();
-			await this.loadTree();
-			await this.executeQuery(document.getElementById('queryInput')?.value || '');
+			await Promise.all([
+				this.loadTree(),
+				this.executeQuery(document.getElementById('queryInput')?.value || '')
+			]);
 		} catch (e) {
 			this.showBulkError(e.message);
 		}
 	},
 
 	async refreshAfterBulk() {
-		await this.loadTree();
-		if (this.currentNode) {
-			await this.selectNode(this.currentNode.uuid);
-		}
+		await Promise.all([
+			this.loadTree(),
+			this.currentNode && this.selectNode(this.currentNode.uuid)
+		]);
 	},
 
 	// ========== RELATIONSHIPS ==========
@@ -1695,6 +2001,7 @@ const App = {
 			if (!resp.ok) throw new Error(data.error);
 			
 			this.closeAddRelationshipModal();
+			this.invalidateQueries();
 			await this.selectNode(this.currentNode.uuid);
 		} catch (e) {
 			errorEl.textContent = e.message;
@@ -1716,6 +2023,7 @@ const App = {
 			const data = await resp.json();
 			if (!resp.ok) throw new Error(data.error);
 			
+			this.invalidateQueries();
 			await this.selectNode(this.currentNode.uuid);
 		} catch (e) {
 			this.showError(e.message);
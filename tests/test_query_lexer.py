@@ -0,0 +1,272 @@
+"""
+Checks the regex Lexer against the character-by-character lexer it
+replaced, which is kept below as the reference for the query syntax.
+"""
+
+import re
+import unittest
+from typing import List, Optional
+
+from dlfi_server.query.parser import Lexer, Token, TokenType
+
+
+class ReferenceLexer:
+	"""The hand-written Lexer as it was before the regex tokenizer, verbatim."""
+	
+	KEYWORDS = {
+		'tag', 'inside', 'path', 'ext', 'files', 'size', 
+		'type', 'limit', 'sort', 'preview'
+	}
+	
+	def __init__(self, query: str):
+		self.query = query
+		self.pos = 0
+		self.tokens: List[Token] = []
+	
+	def tokenize(self) -> List[Token]:
+		"""Convert query string to tokens."""
+		self.tokens = []
+		self.pos = 0
+		
+		while self.pos < len(self.query):
+			self._skip_whitespace()
+			if self.pos >= len(self.query):
+				break
+			
+			char = self.query[self.pos]
+			
+			if char == '"':
+				self._read_quoted()
+			elif char == ':':
+				self._add_token(TokenType.COLON, ':')
+			elif char == '=':
+				self._add_token(TokenType.EQUALS, '=')
+			elif char == '>':
+				if self._peek(1) == '=':
+					self._add_token(TokenType.GTE, '>=')
+					self.pos += 1
+				else:
+					self._add_token(TokenType.GT, '>')
+			elif char == '<':
+				if self._peek(1) == '=':
+					self._add_token(TokenType.LTE, '<=')
+					self.pos += 1
+				else:
+					self._add_token(TokenType.LT, '<')
+			elif char == '|':
+				self._add_token(TokenType.OR, '|')
+			elif char == '(':
+				self._add_token(TokenType.LPAREN, '(')
+			elif char == ')':
+				self._add_token(TokenType.RPAREN, ')')
+			elif char == '-':
+				self._add_token(TokenType.NEGATE, '-')
+			elif char == '^':
+				self._add_token(TokenType.DEEP, '^')
+			elif char == '%':
+				self._add_token(TokenType.REVERSE_DEEP, '%')
+			elif char == '!':
+				self._add_token(TokenType.RELATION, '!')
+			elif char == '?':
+				self._add_token(TokenType.QUESTION, '?')
+			elif char == '*':
+				if self._peek(1) == '*':
+					self._add_token(TokenType.DOUBLESTAR, '**')
+					self.pos += 1
+				else:
+					self._add_token(TokenType.STAR, '*')
+			elif char == '.':
+				if self._peek(1) == '.':
+					self._add_token(TokenType.RANGE, '..')
+					self.pos += 1
+				else:
+					self._read_text()
+					continue  # _read_text advances pos
+			else:
+				self._read_text()
+				continue  # _read_text advances pos
+			
+			self.pos += 1
+		
+		self.tokens.append(Token(TokenType.EOF, '', self.pos))
+		return self.tokens
+	
+	def _skip_whitespace(self):
+		while self.pos < len(self.query) and self.query[self.pos].isspace():
+			self.pos += 1
+	
+	def _peek(self, offset: int = 0) -> Optional[str]:
+		pos = self.pos + offset
+		if pos < len(self.query):
+			return self.query[pos]
+		return None
+	
+	def _add_token(self, type: TokenType, value: str):
+		self.tokens.append(Token(type, value, self.pos))
+	
+	def _read_quoted(self):
+		"""Read a quoted string."""
+		start = self.pos
+		self.pos += 1  # Skip opening quote
+		value = []
+		
+		while self.pos < len(self.query):
+			char = self.query[self.pos]
+			if char == '"':
+				self.tokens.append(Token(TokenType.QUOTED, ''.join(value), start))
+				return
+			elif char == '\\' and self.pos + 1 < len(self.query):
+				self.pos += 1
+				value.append(self.query[self.pos])
+			else:
+				value.append(char)
+			self.pos += 1
+		
+		# Unclosed quote - treat as text
+		self.tokens.append(Token(TokenType.QUOTED, ''.join(value), start))
+	
+	def _read_text(self):
+		"""Read plain text until a special character."""
+		start = self.pos
+		value = []
+		
+		special = set(':=><|()!^%?*"')
+		
+		while self.pos < len(self.query):
+			char = self.query[self.pos]
+			
+			if char.isspace() or char in special:
+				# Check for .. range operator
+				if char == '.' and self._peek(1) == '.':
+					break
+				if char not in special or char == '.':
+					if char.isspace():
+						break
+					value.append(char)
+					self.pos += 1
+					continue
+				break
+			
+			value.append(char)
+			self.pos += 1
+		
+		text = ''.join(value)
+		if text:
+			# Check if it's a number
+			if re.match(r'^-?\d+(\.\d+)?$', text):
+				self.tokens.append(Token(TokenType.NUMBER, text, start))
+			else:
+				self.tokens.append(Token(TokenType.TEXT, text, start))
+
+
+QUERIES = [
+	# Plain terms and fields
+	'',
+	'   ',
+	'cat',
+	'tag:cat',
+	'tag:cat | tag:dog',
+	'(tag:cat | tag:dog) -tag:nsfw',
+	'meta.artist=alice',
+	'name:**',
+	'name:*.png',
+	'name:?',
+	# Quoted strings and escapes
+	'"hello world"',
+	'tag:"two words"',
+	'"say \\"hi\\""',
+	'"back\\\\slash"',
+	'"tab\\tn"',
+	'"a" "b"',
+	'""',
+	'"adjacent"text',
+	# Negation
+	'-tag:cat',
+	'- tag:cat',
+	'!parent:"a/b"',
+	'-!rel:x',
+	'-"quoted"',
+	'foo-bar',
+	'--x',
+	# Ranges and comparisons
+	'size:1..100',
+	'size:..100',
+	'size:1..',
+	'size:>=10',
+	'size:<=10',
+	'size:>10 size:<20',
+	'size:> =10',
+	'created:2024-01-01..2024-12-31',
+	'size:1.5',
+	'size:-3',
+	'size:-3.25',
+	'. .. ...',
+	# Paths with spaces and hierarchy prefixes
+	'inside:"My Vault/Sub Folder"',
+	'inside:My Vault',
+	'^inside:"a b"',
+	'%inside:"a b/c d"',
+	'inside:a/b/c',
+	# Unterminated quotes
+	'"unterminated',
+	'tag:"open',
+	'"ends with backslash\\',
+	'"escaped close\\"',
+	'"',
+	# Whitespace other than spaces
+	'tag:a\ttag:b\ntag:c',
+	'  padded  ',
+]
+
+
+def tokens_of(lexer) -> List[tuple]:
+	return [(t.type, t.value, t.position) for t in lexer.tokenize()]
+
+
+class LexerTest(unittest.TestCase):
+
+	def test_matches_reference_lexer(self):
+		for query in QUERIES:
+			with self.subTest(query=query):
+				new = tokens_of(Lexer(query))
+				old = tokens_of(ReferenceLexer(query))
+				# The old EOF position overshot the query after an unclosed
+				# quote; everything before EOF must be identical
+				self.assertEqual(new[:-1], old[:-1])
+				self.assertEqual(new[-1], (TokenType.EOF, '', len(query)))
+
+	def test_quoted_escapes(self):
+		tokens = Lexer('tag:"say \\"hi\\" \\\\ now"').tokenize()
+		self.assertEqual(tokens[2].type, TokenType.QUOTED)
+		self.assertEqual(tokens[2].value, 'say "hi" \\ now')
+		self.assertEqual(tokens[2].position, 4)
+
+	def test_negation_prefixes(self):
+		types = [t.type for t in Lexer('-tag:a !rel:b').tokenize()]
+		self.assertEqual(types, [
+			TokenType.NEGATE, TokenType.TEXT, TokenType.COLON, TokenType.TEXT,
+			TokenType.RELATION, TokenType.TEXT, TokenType.COLON, TokenType.TEXT,
+			TokenType.EOF,
+		])
+
+	def test_range_operators(self):
+		self.assertEqual(
+			[(t.type, t.value) for t in Lexer('size:..5 size:>=2').tokenize()[:-1]],
+			[
+				(TokenType.TEXT, 'size'), (TokenType.COLON, ':'), (TokenType.RANGE, '..'), (TokenType.NUMBER, '5'),
+				(TokenType.TEXT, 'size'), (TokenType.COLON, ':'), (TokenType.GTE, '>='), (TokenType.NUMBER, '2'),
+			]
+		)
+
+	def test_quoted_path_keeps_spaces(self):
+		tokens = Lexer('inside:"My Vault/Sub Folder"').tokenize()
+		self.assertEqual(tokens[2], Token(TokenType.QUOTED, 'My Vault/Sub Folder', 7))
+
+	def test_unterminated_quote_runs_to_end(self):
+		tokens = Lexer('tag:"open ended').tokenize()
+		self.assertEqual(tokens[2], Token(TokenType.QUOTED, 'open ended', 4))
+		self.assertEqual(tokens[3], Token(TokenType.EOF, '', 15))
+
+
+if __name__ == '__main__':
+	unittest.main()